@@ -1,132 +1,269 @@
+import logging
+import threading
+from contextlib import ExitStack, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from functools import partial
-
+from itertools import chain, islice
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.exception import response_for_exception
+from django.db import connection, connections, transaction
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from pprint import pformat
 from collections import OrderedDict
 
 from rest_framework.utils.serializer_helpers import ReturnList
 
+from .benchmark import get_benchmark
+from .matchers import (
+    CompareLimitError, Unordered, canonical, compile_pattern, compiled, data_type
+)
+from .phases import instrument, instrument_fields
+from .profiling import get_profiler
+from .queries import repeated_templates
+from .stats import log_log_slope, percentile
+from .streaming import iter_chunks
+
+__all__ = [
+    'AllRestUsers', 'BaseAPITestCase', 'MetaRestTestCase', 'RestTestCase', 'RestUser',
+    'CompareLimitError', 'Unordered', 'TRUNCATED',
+    'bounded_data', 'compare', 'compare_dicts', 'compare_json', 'compare_lists', 'compare_mismatches',
+    'compile_pattern', 'convert_data',
+    'BODY_METHODS', 'COMPLEXITIES', 'DISABLED_STATUS_CODES', 'OPERATIONS',
+]
+
+logger = logging.getLogger('rest_test')
+
+# exponents of complexities of operations, time ~ size ** exponent
+COMPLEXITIES = {
+    'constant': 0,
+    'logarithmic': 0,
+    'linear': 1,
+    'linearithmic': 1,
+    'quadratic': 2,
+    'cubic': 3,
+}
+
+# methods sending input data in the request body
+BODY_METHODS = ('post', 'put', 'patch', 'delete')
+
+DISABLED_STATUS_CODES = (
+    status.HTTP_401_UNAUTHORIZED,
+    status.HTTP_404_NOT_FOUND,
+    status.HTTP_405_METHOD_NOT_ALLOWED,
+    status.HTTP_403_FORBIDDEN
+)
+
 
 def compare_lists(data, expected_data):
-    data_gen = (item for item in data)
-    expected_data_gen = (item for item in expected_data)
+    return compiled(expected_data).match(data)
 
-    for value in expected_data_gen:
-        if value is ...:
-            try:
-                next_value = expected_data_gen.send(None)
-            except StopIteration:
-                # last item is ellipsis
-                return True
 
-            if next_value is ...:
-                raise TypeError('Consecutively usage of ... (Ellipsis) is not allowed in list.')
+def compare_dicts(data, expected_data):
+    return compiled(expected_data).match(data)
 
-            try:
-                while not compare(data_gen.send(None), next_value):
-                    pass
-            except StopIteration:
-                # next expected item is not in data
-                return False
 
-        else:
-            try:
-                data_item = data_gen.send(None)
-            except StopIteration:
-                # there are more expected items
-                return False
-
-            if not compare(data_item, value):
-                # expected item is not in data
-                return False
-
-    try:
-        data_gen.send(None)
-    except StopIteration:
-        return True
-    else:
-        # More items in data
-        return False
+def compare(data, expected_data, max_depth=None, max_nodes=None):
+    return compiled(expected_data).match(data, max_depth=max_depth, max_nodes=max_nodes)
 
 
-def compare_dicts(data, expected_data):
-    subset = False
+def compare_mismatches(data, expected_data, max_mismatches=10, max_depth=None, max_nodes=None):
+    """
+    Compare data and return list of mismatches with their JSON pointer paths, empty list if data match.
+    """
+    return compiled(expected_data).mismatches(
+        data, max_mismatches=max_mismatches, max_depth=max_depth, max_nodes=max_nodes
+    )
 
-    # subset
-    if ... in expected_data:
-        if expected_data[...] is ...:
-            subset = True
-        else:
-            raise TypeError('Bad usage of ... (Ellipsis).')
 
-    compared_keys = []
+def compare_json(content, expected_data):
+    """
+    Compare rendered JSON content (bytes, str or iterable of chunks) without building the whole data.
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        content = iter_chunks(content)
+    elif isinstance(content, str):
+        content = [content]
+    return compiled(expected_data).match_json(content)
 
-    for key, value in expected_data.items():
-        if key is ...:
-            continue
 
-        if value is ...:
-            if key not in data:
-                # Key is not found in data
-                return False
+def convert_data(data):
+    # without recursion - converted items are collected in results and replaced by their container
+    results = []
+    stack = [(data, False)]
+
+    while stack:
+        value, expanded = stack.pop()
 
-            else:
-                compared_keys.append(key)
+        if type(value) == list or isinstance(value, ReturnList):
+            items = value
+        elif type(value) == dict or isinstance(value, OrderedDict):
+            items = value.values()
         else:
-            if key in data:
-                if compare(data[key], expected_data[key]):
-                    compared_keys.append(key)
-                else:
-                    # values are not the same
-                    return False
+            results.append(value)
+            continue
 
+        if not expanded:
+            stack.append((value, True))
+            stack.extend((item, False) for item in reversed(list(items)))
+        else:
+            converted = results[len(results) - len(value):]
+            del results[len(results) - len(value):]
+            if isinstance(value, list):
+                results.append(converted)
             else:
-                # Key is not found in data
-                return False
+                results.append(dict(zip(value.keys(), converted)))
 
-    if not subset:
-        if len(compared_keys) != len(data):
-            # More items in data
-            return False
+    return results[0]
 
-    return True
 
+class _Truncated(object):
+    def __repr__(self):
+        return '<...>'
 
-def compare(data, expected_data):
 
-    # if expected_data is type, only test if type of data is the same
-    if isinstance(expected_data, type) and type(data) == expected_data:
-        return True
+TRUNCATED = _Truncated()
 
-    expected_data_type = type(expected_data)
 
-    if expected_data_type != type(data):
-        # different types
-        return False
+def bounded_data(data, max_depth=None, max_nodes=None):
+    """
+    Plain copy of data (for formatting) without recursion, containers deeper than max_depth and values after
+    max_nodes are replaced by TRUNCATED, so the rest of data is not even visited.
+    """
+    nodes = 0
+    root = [None]
+    # (copied container, key, value, depth)
+    stack = [(root, 0, data, 0)]
+
+    while stack:
+        parent, key, value, depth = stack.pop()
+        if max_nodes is not None and nodes >= max_nodes:
+            parent[key] = TRUNCATED
+            continue
+        nodes += 1
+
+        value_type = data_type(value)
+        if value_type != list and value_type != dict:
+            parent[key] = value
+            continue
+        if max_depth is not None and depth >= max_depth:
+            parent[key] = TRUNCATED
+            continue
 
-    if expected_data_type == list:
-        return compare_lists(data, expected_data)
-    elif expected_data_type == dict:
-        return compare_dicts(data, expected_data)
-    else:
-        return data == expected_data
+        items = enumerate(value) if value_type == list else value.items()
+        if max_nodes is not None:
+            items = islice(items, max_nodes - nodes)
+        items = list(items)
 
+        if value_type == list:
+            copied = [None] * len(items)
+            if len(items) < len(value):
+                copied.append(TRUNCATED)
+        else:
+            copied = dict.fromkeys(item_key for item_key, item in items)
+            if len(items) < len(value):
+                copied[TRUNCATED] = TRUNCATED
+        parent[key] = copied
+        stack.extend((copied, item_key, item, depth + 1) for item_key, item in reversed(items))
 
-def convert_data(data):
-    if type(data) == list or isinstance(data, ReturnList):
-        return [convert_data(item) for item in data]
-    elif type(data) == dict or isinstance(data, OrderedDict):
-        return {key: convert_data(value) for key, value in data.items()}
-    else:
-        return data
+    return root[0]
 
 
 class BaseAPITestCase(APITestCase):
+    # limits of compared response data, exceeding them fails the test (see CompareLimitError)
+    compare_max_depth = None
+    compare_max_nodes = None
+
+    # dispatch requests straight to the resolved views without the handler and middlewares
+    direct_dispatch = False
+
+    # encode input data of request bodies only once per class, input data have to be replaced (not changed) then
+    encode_inputs_once = False
+
     def _request(self, method, url, data=None):
         # TODO add URL to assert message
         # print("Tested url: '{url}'".format(url=url))
-        response = getattr(self.client, method)(url, data=data, format='json')
+        if self.direct_dispatch:
+            match = self._resolve(url)
+            if match is not None:
+                return self._dispatch(match, method, url, data)
+
+        client_lock = self.__dict__.get('_client_lock')
+        if client_lock is not None:
+            # probe thread, the client toggles the close_old_connections receiver of request signals
+            with client_lock:
+                return self._send(self.client, method, url, data)
+
+        response = self._send(self.client, method, url, data)
+        return response
+
+    def _class_cache(self, name):
+        # dict shared by tests of the class (not by its subclasses)
+        cls = self.__class__
+        cache = cls.__dict__.get(name)
+        if cache is None:
+            cache = {}
+            type.__setattr__(cls, name, cache)
+        return cache
+
+    def _send(self, requester, method, url, data=None):
+        # requester is the client or the request factory
+        if self.encode_inputs_once and data is not None and method in BODY_METHODS:
+            body, content_type = self._encode(data)
+            return requester.generic(method.upper(), url, body, content_type)
+
+        return getattr(requester, method)(url, data=data, format='json')
+
+    def _encode(self, data):
+        encoded_inputs = self._class_cache('_encoded_inputs')
+        encoded = encoded_inputs.get(id(data))
+        if encoded is None or encoded[0] is not data:
+            if _has_files(data):
+                # files are read only once
+                encoded = (data, encode_multipart(BOUNDARY, data), MULTIPART_CONTENT)
+            else:
+                encoded = (data, JSONRenderer().render(data), 'application/json')
+            # input data are kept, so their id is not reused
+            encoded_inputs[id(data)] = encoded
+        return encoded[1], encoded[2]
+
+    def _resolve(self, url):
+        # urls are resolved once per class, unresolvable urls (None) are requested by the client
+        resolved_urls = self._class_cache('_resolved_urls')
+
+        key = (settings.ROOT_URLCONF, url)
+        if key not in resolved_urls:
+            try:
+                resolved_urls[key] = resolve(urlsplit(url).path)
+            except Resolver404:
+                resolved_urls[key] = None
+        return resolved_urls[key]
+
+    def _dispatch(self, match, method, url, data=None):
+        if self.__dict__.get('_request_factory') is None:
+            self._request_factory = APIRequestFactory()
+
+        request = self._send(self._request_factory, method, url, data)
+        force_authenticate(request, user=self.__dict__.get('_authenticated_user'))
+        request.resolver_match = match
+
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+        except (Http404, PermissionDenied) as exc:
+            response = response_for_exception(request, exc)
+
+        if hasattr(response, 'render'):
+            response.render()
         return response
 
     def _get(self, url, data=None):
@@ -144,48 +281,132 @@ class BaseAPITestCase(APITestCase):
     def _patch(self, url, data=None):
         return self._request('patch', url, data=data)
 
+    # budget of assert messages, the rest of formatted data is truncated (None means unlimited)
+    message_max_bytes = 64 * 1024
+    message_max_lines = 1000
+    # formatted data deeper than the depth are cut (None means unlimited, deep data can exceed recursion limit)
+    message_max_depth = 20
+    # number of reported mismatches of response data
+    message_max_mismatches = 10
+
+    def truncate_message(self, message):
+        lines = message.splitlines()
+        truncated_lines = 0
+        if self.message_max_lines is not None and len(lines) > self.message_max_lines:
+            truncated_lines = len(lines) - self.message_max_lines
+            message = '\n'.join(lines[:self.message_max_lines])
+
+        truncated_bytes = 0
+        if self.message_max_bytes is not None:
+            encoded = message.encode('utf-8')
+            if len(encoded) > self.message_max_bytes:
+                truncated_bytes = len(encoded) - self.message_max_bytes
+                message = encoded[:self.message_max_bytes].decode('utf-8', errors='ignore')
+
+        if truncated_lines or truncated_bytes:
+            message = "{message}\n... truncated ({lines} lines, {bytes} bytes)".format(
+                message=message, lines=truncated_lines, bytes=truncated_bytes
+            )
+        return message
+
+    def format_message(self, msg, **info):
+        # called only when assertion fails, data are cut before formatting (every formatted value has 2 bytes at least)
+        max_nodes = None if self.message_max_bytes is None else self.message_max_bytes // 2
+        info = bounded_data(info, max_depth=self.message_max_depth, max_nodes=max_nodes)
+        return "{msg}\n{info}".format(msg=msg, info=self.truncate_message(pformat(info)))
+
     # assert methods
     def assert_disabled(self, status_code, msg):
-        expected_status_codes = (
-            status.HTTP_401_UNAUTHORIZED,
-            status.HTTP_404_NOT_FOUND,
-            status.HTTP_405_METHOD_NOT_ALLOWED,
-            status.HTTP_403_FORBIDDEN
-        )
-
-        # TODO refactor - reverse msg composing
-        msg = "{msg}\n{info}".format(
-            msg=msg,
-            info=pformat(dict(
-                response_status_code=status_code,
-                expected_status_codes=expected_status_codes
-            ))
+        assert status_code in DISABLED_STATUS_CODES, self.format_message(
+            msg,
+            response_status_code=status_code,
+            expected_status_codes=DISABLED_STATUS_CODES
         )
-        assert status_code in expected_status_codes, msg
 
     def assert_compare(self, data, expected_data, msg):
-        data = convert_data(data)
+        matcher = compiled(expected_data)
+        mismatches = matcher.mismatches(
+            data,
+            max_mismatches=self.message_max_mismatches,
+            max_depth=self.compare_max_depth,
+            max_nodes=self.compare_max_nodes
+        )
 
-        # TODO refactor - reverse msg composing
-        msg = "{msg}\n{info}".format(
-            msg=msg,
-            info=pformat(dict(
-                response_data=data,
-                expected_data=expected_data
-            ))
+        assert not mismatches, self.format_message(
+            msg,
+            mismatches=[str(mismatch) for mismatch in mismatches],
+            response_data=data,
+            expected_data=matcher.pattern
         )
-        assert compare(data, expected_data), msg
+
+    def assert_compare_stream(self, response, expected_data, msg):
+        if response.streaming:
+            content = response.streaming_content
+        else:
+            content = iter_chunks(response.content)
+
+        matcher = compiled(expected_data)
+
+        assert matcher.match_json(content), \
+            self.format_message(msg, response_data=response.data, expected_data=matcher.pattern)
 
     def assert_status_code(self, response_status_code, expected_status_code, msg):
-        # TODO refactor - reverse msg composing
-        msg = """{msg}
+        assert response_status_code == expected_status_code, """{msg}
         Response output data is empty.
         Expected response status code was '{expected_status_code}' but got '{response_status_code}'.""".format(
             msg=msg,
             response_status_code=response_status_code,
             expected_status_code=expected_status_code
         )
-        assert response_status_code == expected_status_code, msg
+
+    def assert_max_queries(self, queries, max_queries, msg):
+        assert len(queries) <= max_queries, self.truncate_message(
+            "{msg}\nExpected at most {max_queries} queries but {count} were executed:\n{queries}".format(
+                msg=msg,
+                max_queries=max_queries,
+                count=len(queries),
+                queries='\n'.join(
+                    '{number}. {sql}'.format(number=number, sql=query['sql'])
+                    for number, query in enumerate(queries, 1)
+                )
+            )
+        )
+
+    def assert_max_queries_growth(self, queries_by_size, max_growth, msg):
+        counts = {size: len(queries) for size, queries in queries_by_size.items()}
+        smallest, largest = min(counts), max(counts)
+        growth = max(counts.values()) - counts[smallest]
+
+        assert growth <= max_growth, self.truncate_message(
+            "{msg}\nExpected number of queries to grow by at most {max_growth} but it grew by {growth} "
+            "(size: queries {counts}).\nRepeated queries of size {largest}:\n{templates}".format(
+                msg=msg,
+                max_growth=max_growth,
+                growth=growth,
+                counts=counts,
+                largest=largest,
+                templates='\n'.join(
+                    '{count}x {template}'.format(count=count, template=template)
+                    for template, count in repeated_templates(queries_by_size[largest])
+                )
+            )
+        )
+
+    def assert_max_complexity(self, complexity, msg):
+        assert complexity['exponent'] <= complexity['max_exponent'], self.format_message(
+            "{msg}\nExpected time to grow at most like {max_complexity} (exponent {max_exponent:.2f}) "
+            "but its exponent was {exponent:.2f}.".format(msg=msg, **complexity),
+            sizes=complexity['sizes'],
+            times=complexity['times']
+        )
+
+    def assert_max_time(self, timing, msg):
+        assert timing['time'] <= timing['max_time'], self.format_message(
+            "{msg}\nExpected {percentile}th percentile of time at most {max_time:.6f}s but it was {time:.6f}s.".format(
+                msg=msg, **timing
+            ),
+            samples=timing['samples']
+        )
 
     url = ''
     url_detail = ''
@@ -209,9 +430,70 @@ class BaseAPITestCase(APITestCase):
         return self._patch(self.url_detail, data=input_data)
 
     def login(self, user):
+        self._authenticated_user = user
         self.client.force_authenticate(user=user)
 
 
+def _has_files(data):
+    # multipart input data - files in values (or in lists of values) of a dict
+    if data_type(data) != dict:
+        return False
+    for value in data.values():
+        values = value if data_type(value) == list else (value,)
+        if any(hasattr(item, 'read') for item in values):
+            return True
+    return False
+
+
+def _content_length(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class _ProbeLock(object):
+    """
+    Lock of connections shared by probe threads, a probe holds it from its first use of a connection to its end.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def acquire(self):
+        if not getattr(self.local, 'held', False):
+            self.lock.acquire()
+            self.local.held = True
+
+    def release(self):
+        if getattr(self.local, 'held', False):
+            self.local.held = False
+            self.lock.release()
+
+
+class _LockedConnection(object):
+    # transaction state of a connection (savepoints, atomic blocks) is not thread-safe, so a probe using
+    # the shared connection (ie. atomic view or ATOMIC_REQUESTS) locks it before it reads or changes the state
+    def __init__(self, connection, probe_lock):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_probe_lock', probe_lock)
+
+    def __getattr__(self, name):
+        self._probe_lock.acquire()
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        self._probe_lock.acquire()
+        setattr(self._connection, name, value)
+
+
+def _share_connections(shared_connections, probe_lock):
+    # probe threads use connections of the test (and so its transaction), requests touching the database
+    # are serialized by the lock, the rest of requests (ie. rejected by permissions) run concurrently
+    for shared_connection in shared_connections:
+        connections[shared_connection.alias] = _LockedConnection(shared_connection, probe_lock)
+
+
 OPERATIONS = ('create', 'retrieve', 'update', 'delete', 'patch', 'list')
 
 
@@ -238,20 +520,39 @@ class MetaRestTestCase(type):
 
     @property
     def test_names(self):
-        if not self.__test__:
-            raise StopIteration()
+        for test_name, (rest_user, operation) in self.test_index.items():
+            yield test_name, rest_user, operation
 
-        for rest_user in self.rest_users:
-            for operation in OPERATIONS:
-                yield 'test_{operation}_by_{rest_user.name}'.format(
-                    operation=operation, rest_user=rest_user
-                ), rest_user, operation
+    @property
+    def test_index(self):
+        """
+        Generated test names -> (rest_user, operation), built once per class.
+
+        Allowed operations are not part of the index, they are resolved when the test is called.
+        """
+        test_index = self.__dict__.get('_test_index')
+        if test_index is None:
+            test_index = {}
+            if self.__test__:
+                for rest_user in self.rest_users:
+                    for operation in OPERATIONS:
+                        test_name = 'test_{operation}_by_{rest_user.name}'.format(
+                            operation=operation, rest_user=rest_user
+                        )
+                        test_index[test_name] = (rest_user, operation)
+            type.__setattr__(self, '_test_index', test_index)
+        return test_index
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ('__test__', '_rest_users') and '_test_index' in self.__dict__:
+            # invalidate index of generated tests
+            type.__delattr__(self, '_test_index')
 
     def __getattr__(self, attr_name):
-        for test_name, rest_user, operation in self.test_names:
-            if test_name == attr_name:
-                return lambda s: True
-        raise AttributeError()
+        if attr_name.startswith('test_') and attr_name in self.test_index:
+            return lambda s: True
+        raise AttributeError(attr_name)
 
     def __init__(cls, name, bases, attrs):
         rest_users = set()
@@ -279,10 +580,11 @@ class MetaRestTestCase(type):
 
         cls._rest_users_names = rest_users_names
         cls._rest_users = rest_users
+        cls._reset_probes()
         super().__init__(name, bases, attrs)
 
     def __dir__(self):
-        return [test_name for test_name, rest_user, operation in self.test_names] + super().__dir__()
+        return list(self.test_index) + super().__dir__()
 
 
 class RestUser(object):
@@ -327,6 +629,47 @@ class RestTestCase(BaseAPITestCase, metaclass=MetaRestTestCase):
     anonymous_user = RestUser
     output_status_create = status.HTTP_201_CREATED
 
+    # requests of operations with output_max_time_{operation}[_{user}] are repeated and timed, the percentile
+    # of measured times (in seconds) is compared with the limit, see RestTestCase.timing
+    output_time_warmup = 1
+    output_time_repeats = 10
+    output_time_percentile = 90
+    # measured times of the last timed operation
+    timing = None
+
+    # sizes of fixtures (see create_fixture) for output_max_queries_growth_{operation}[_{user}] - the number
+    # of queries of the operation can't grow by more than the limit with the size of data (ie. N+1 queries)
+    fixture_sizes = (1, 10)
+
+    # geometric sizes of fixtures (see create_fixture) for output_max_complexity_{operation}[_{user}] - the time
+    # of the operation is measured with every size and the exponent k of time ~ size ** k can't be greater than
+    # the exponent of the declared complexity (see COMPLEXITIES, or a number) with tolerance
+    complexity_sizes = (100, 1000, 10000)
+    complexity_repeats = 3
+    complexity_tolerance = 0.5
+    # measured times of the last operation with complexity
+    complexity = None
+
+    # split time of requests of allowed operations into phases (see rest_test.phases) and store them in `phases`
+    phase_timing = False
+    phases = None
+
+    # time fields of serializers of allowed operations (see rest_test.phases) and store them in `field_times`
+    field_timing = False
+    field_times = None
+
+    # directory of cProfile stats of generated tests (or REST_TEST_PROFILE for all test cases), see rest_test.profiling
+    profile_dir = None
+
+    # compare expected output data with rendered response content parsed incrementally instead of response.data
+    stream_compare = False
+
+    # number of threads sending requests of disabled operations concurrently (None sends them one by one)
+    disabled_probe_workers = None
+
+    # send every distinct probe of disabled operations only once per class, later rejections are taken as granted
+    memoize_probes = False
+
     __test = False
 
     def _get_input_data(self, rest_user, operation):
@@ -343,6 +686,14 @@ class RestTestCase(BaseAPITestCase, metaclass=MetaRestTestCase):
             getattr(self, 'output_{operation}'.format(operation=operation), None)
         )
 
+    def _get_output_matcher(self, rest_user, operation):
+        expected_output_data = self._get_output_data(rest_user, operation)
+        if expected_output_data is None:
+            return None
+
+        # expected output data are compiled only once, shared by users and test cases unless they are replaced
+        return compiled(expected_output_data)
+
     def _get_output_status(self, rest_user, operation):
         return getattr(
             self,
@@ -350,6 +701,101 @@ class RestTestCase(BaseAPITestCase, metaclass=MetaRestTestCase):
             getattr(self, 'output_status_{operation}'.format(operation=operation), status.HTTP_200_OK)
         )
 
+    def _get_output_max_queries(self, rest_user, operation):
+        return getattr(
+            self,
+            'output_max_queries_{operation}_{rest_user.name}'.format(operation=operation, rest_user=rest_user),
+            getattr(self, 'output_max_queries_{operation}'.format(operation=operation), None)
+        )
+
+    def _get_output_max_queries_growth(self, rest_user, operation):
+        return getattr(
+            self,
+            'output_max_queries_growth_{operation}_{rest_user.name}'.format(operation=operation, rest_user=rest_user),
+            getattr(self, 'output_max_queries_growth_{operation}'.format(operation=operation), None)
+        )
+
+    def create_fixture(self, size):
+        """
+        Create data of the size (ie. number of listed objects) for output_max_queries_growth_{operation}
+        and output_max_complexity_{operation}.
+        """
+        raise NotImplementedError('{cls} has to implement create_fixture(size).'.format(cls=self.__class__.__name__))
+
+    def _queries_by_size(self, operation, input_data, expected_status_code, msg):
+        # every fixture with its request is rolled back
+        queries_by_size = {}
+        for size in self.fixture_sizes:
+            with transaction.atomic():
+                self.create_fixture(size)
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(self, operation)(input_data)
+                transaction.set_rollback(True)
+            # queries of failed requests (ie. rejected input data) are not comparable
+            self.assert_status_code(
+                response.status_code, expected_status_code, '{msg} Fixture size: {size}.'.format(msg=msg, size=size)
+            )
+            queries_by_size[size] = queries.captured_queries
+        return queries_by_size
+
+    def _get_output_max_complexity(self, rest_user, operation):
+        return getattr(
+            self,
+            'output_max_complexity_{operation}_{rest_user.name}'.format(operation=operation, rest_user=rest_user),
+            getattr(self, 'output_max_complexity_{operation}'.format(operation=operation), None)
+        )
+
+    def _get_complexity_exponent(self, max_complexity):
+        # declaration is validated before the fixtures are created and timed
+        if isinstance(max_complexity, (int, float)) and not isinstance(max_complexity, bool):
+            return max_complexity
+        if max_complexity in COMPLEXITIES:
+            return COMPLEXITIES[max_complexity]
+        raise ValueError('Unknown complexity {max_complexity!r}, use a number or one of: {complexities}.'.format(
+            max_complexity=max_complexity, complexities=', '.join(COMPLEXITIES)
+        ))
+
+    def _times_by_size(self, operation, input_data):
+        # median time of requests with every fixture, the fixture is rolled back
+        times = []
+        for size in self.complexity_sizes:
+            with transaction.atomic():
+                self.create_fixture(size)
+                samples, queries, response_bytes = self._measure(operation, input_data, self.complexity_repeats)
+                transaction.set_rollback(True)
+            times.append(percentile(samples, 50))
+        return times
+
+    def _get_output_max_time(self, rest_user, operation):
+        return getattr(
+            self,
+            'output_max_time_{operation}_{rest_user.name}'.format(operation=operation, rest_user=rest_user),
+            getattr(self, 'output_max_time_{operation}'.format(operation=operation), None)
+        )
+
+    def _measure(self, operation, input_data, repeats, capture=False):
+        """
+        Times of repeated requests, with capture also numbers of their queries and size of the last response.
+        """
+        samples = []
+        queries = []
+        response_bytes = None
+        for iteration in range(self.output_time_warmup + repeats):
+            # every request is rolled back, so all of them (ie. delete) see the same data
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) if capture else nullcontext() as captured:
+                    start = perf_counter()
+                    response = getattr(self, operation)(input_data)
+                    duration = perf_counter() - start
+                transaction.set_rollback(True)
+
+            if iteration >= self.output_time_warmup:
+                samples.append(duration)
+                if capture:
+                    queries.append(len(captured))
+                    response_bytes = _content_length(response)
+        return samples, queries, response_bytes
+
     def _test(self, rest_user=None, operation=''):
         msg = "Operation '{operation}' for '{rest_user.name}' is enabled.".format(
             operation=operation, rest_user=rest_user
@@ -360,27 +806,98 @@ class RestTestCase(BaseAPITestCase, metaclass=MetaRestTestCase):
 
         input_data = self._get_input_data(rest_user, operation)
 
-        expected_output_data = self._get_output_data(rest_user, operation)
-
-        response = getattr(self, operation)(input_data)
-
-        response_status_code = response.status_code
-
+        expected_output_data = self._get_output_matcher(rest_user, operation)
         if expected_output_data is None:
             # TODO assert if it is defined some expected response status code
-            self.assert_status_code(response_status_code, status.HTTP_204_NO_CONTENT, msg)
+            expected_status_code = status.HTTP_204_NO_CONTENT
         else:
             expected_status_code = self._get_output_status(rest_user, operation)
-            self.assert_status_code(response_status_code, expected_status_code, msg)
 
-            # TODO - maybe: if hasattr(response, 'data') else None
-            self.assert_compare(response.data, expected_output_data, msg)
+        benchmark = get_benchmark()
+        if benchmark.enabled:
+            benchmark.add(self, rest_user, operation, *self._measure(operation, input_data, benchmark.repeats, True))
+
+        max_queries_growth = self._get_output_max_queries_growth(rest_user, operation)
+        if max_queries_growth is not None:
+            queries_by_size = self._queries_by_size(operation, input_data, expected_status_code, msg)
+
+        max_complexity = self._get_output_max_complexity(rest_user, operation)
+        if max_complexity is not None:
+            max_exponent = self._get_complexity_exponent(max_complexity) + self.complexity_tolerance
+            times = self._times_by_size(operation, input_data)
+            self.complexity = {
+                'operation': operation,
+                'rest_user': rest_user.name,
+                'sizes': list(self.complexity_sizes),
+                'times': times,
+                'exponent': log_log_slope(self.complexity_sizes, times),
+                'max_complexity': max_complexity,
+                'max_exponent': max_exponent,
+            }
+
+        max_time = self._get_output_max_time(rest_user, operation)
+        if max_time is not None:
+            samples, queries, response_bytes = self._measure(operation, input_data, self.output_time_repeats)
+            self.timing = {
+                'operation': operation,
+                'rest_user': rest_user.name,
+                'samples': samples,
+                'percentile': self.output_time_percentile,
+                'time': percentile(samples, self.output_time_percentile),
+                'max_time': max_time,
+            }
+
+        max_queries = self._get_output_max_queries(rest_user, operation)
+        with ExitStack() as stack:
+            if max_queries is not None:
+                queries = stack.enter_context(CaptureQueriesContext(connection))
+            if self.phase_timing:
+                phase_timer = stack.enter_context(instrument())
+            if self.field_timing:
+                field_timer = stack.enter_context(instrument_fields())
+
+            response = getattr(self, operation)(input_data)
+
+        if self.phase_timing:
+            self.phases = dict(
+                phase_timer.times, operation=operation, rest_user=rest_user.name, total=phase_timer.total
+            )
+        if self.field_timing:
+            self.field_times = field_timer.results
+
+        response_status_code = response.status_code
+        self.assert_status_code(response_status_code, expected_status_code, msg)
+
+        if expected_output_data is not None:
+            if self.stream_compare:
+                self.assert_compare_stream(response, expected_output_data, msg)
+            else:
+                # TODO - maybe: if hasattr(response, 'data') else None
+                self.assert_compare(response.data, expected_output_data, msg)
+
+        if max_queries is not None:
+            self.assert_max_queries(queries.captured_queries, max_queries, msg)
+
+        if max_queries_growth is not None:
+            self.assert_max_queries_growth(queries_by_size, max_queries_growth, msg)
+
+        if max_complexity is not None:
+            self.assert_max_complexity(self.complexity, msg)
+
+        if max_time is not None:
+            self.assert_max_time(self.timing, msg)
 
     def _get_test(self, rest_user, operation):
         if rest_user.can(operation):
-            return partial(self._test, rest_user=rest_user, operation=operation)
+            test = partial(self._test, rest_user=rest_user, operation=operation)
         else:
-            return partial(self._test_disabled, rest_user=rest_user, operation=operation)
+            test = partial(self._test_disabled, rest_user=rest_user, operation=operation)
+
+        profiler = get_profiler(self.profile_dir)
+        if profiler is not None:
+            test_name = 'test_{operation}_by_{rest_user.name}'.format(operation=operation, rest_user=rest_user)
+            test = partial(profiler.profile, self, test_name, test)
+        return test
 
     def _test_disabled(self, rest_user=None, operation=''):
         msg = "Operation '{operation}' for '{rest_user.name}' is disabled.".format(
@@ -389,22 +906,129 @@ class RestTestCase(BaseAPITestCase, metaclass=MetaRestTestCase):
         if rest_user.bound_user is not None:
             self.login(rest_user.bound_user)
 
-        # no input data
-        input_data_list = [None]
+        # no input data and input data for allowed users, duplicates are sent only once
+        input_data_list = []
+        canonical_inputs = set()
+        unhashable_inputs = []
+        another_input_data_list = (
+            self._get_input_data(another_rest_user, operation)
+            for another_rest_user in self.__class__.rest_users
+            if rest_user != another_rest_user and another_rest_user.can(operation)
+        )
+        for input_data in chain([None], another_input_data_list):
+            try:
+                canonical_input = canonical(input_data, self.__class__._probe_table)
+            except TypeError:
+                # unhashable data are compared one by one
+                if input_data in unhashable_inputs:
+                    continue
+                unhashable_inputs.append(input_data)
+                input_data_list.append((input_data, None))
+                continue
+
+            if canonical_input not in canonical_inputs:
+                canonical_inputs.add(canonical_input)
+                input_data_list.append((input_data, self._get_probe_key(rest_user, operation, canonical_input)))
+
+        if self.memoize_probes:
+            rejected_probes = self.__class__._rejected_probes
+            probes = [(input_data, key) for input_data, key in input_data_list if key not in rejected_probes]
+            self.__class__._saved_probes += len(input_data_list) - len(probes)
+            input_data_list = probes
+
+        if self.disabled_probe_workers and len(input_data_list) > 1:
+            status_codes = self._probe_concurrently(
+                rest_user, operation, [input_data for input_data, key in input_data_list]
+            )
+        else:
+            status_codes = (
+                getattr(self, operation)(input_data).status_code for input_data, key in input_data_list
+            )
+
+        for (input_data, key), status_code in zip(input_data_list, status_codes):
+            if self.memoize_probes and key is not None and status_code in DISABLED_STATUS_CODES:
+                self.__class__._rejected_probes.add(key)
+            self.assert_disabled(status_code, msg)
+
+    def _get_probe_identity(self, rest_user):
+        """
+        Authentication identity of the probes, ie. return group of the user to share probes of users of the group.
+        """
+        return rest_user.bound_user
+
+    def _get_probe_key(self, rest_user, operation, canonical_input):
+        if not self.memoize_probes:
+            return None
+
+        key = (self._get_probe_identity(rest_user), operation, self.url, self.url_detail, canonical_input)
+        try:
+            hash(key)
+        except TypeError:
+            # ie. unsaved user
+            return None
+        return key
+
+    def _probe(self, rest_user, operation, input_data, client_lock):
+        # called in a probe thread, the request is sent by a copy of the test case straight to the view, so no
+        # request signals close the shared connections, unresolvable urls are requested by its own client
+        probe = copy(self)
+        probe.client = self.client_class()
+        probe.direct_dispatch = True
+        probe._request_factory = None
+        probe._authenticated_user = None
+        probe._client_lock = client_lock
+        if rest_user.bound_user is not None:
+            probe.login(rest_user.bound_user)
+        return getattr(probe, operation)(input_data).status_code
 
-        # input data for allowed users
-        for another_rest_user in self.__class__.rest_users:
-            if rest_user != another_rest_user and another_rest_user.can(operation):
-                another_input_data = self._get_input_data(another_rest_user, operation)
-                if another_input_data not in input_data_list:
-                    input_data_list.append(another_input_data)
+    def _probe_concurrently(self, rest_user, operation, input_data_list):
+        shared_connections = connections.all()
+        probe_lock = _ProbeLock()
+        client_lock = threading.Lock()
 
-        for input_data in input_data_list:
-            response = getattr(self, operation)(input_data)
-            self.assert_disabled(response.status_code, msg)
+        def probe(input_data):
+            try:
+                return self._probe(rest_user, operation, input_data, client_lock)
+            finally:
+                probe_lock.release()
+
+        for shared_connection in shared_connections:
+            shared_connection.inc_thread_sharing()
+        try:
+            with ThreadPoolExecutor(
+                self.disabled_probe_workers, initializer=_share_connections, initargs=(shared_connections, probe_lock)
+            ) as executor:
+                # status codes are asserted after all probes are finished
+                return list(executor.map(probe, input_data_list))
+        finally:
+            for shared_connection in shared_connections:
+                shared_connection.dec_thread_sharing()
+
+    @classmethod
+    def _reset_probes(cls):
+        # canonical forms of input data and keys of rejected probes, see _test_disabled
+        cls._probe_table = {}
+        cls._rejected_probes = set()
+        cls._saved_probes = 0
+
+    @classmethod
+    def setUpClass(cls):
+        # rejections are memoized per run of the class, objects of fixtures could be recreated by another run
+        cls._reset_probes()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls._saved_probes:
+            logger.info(
+                '%s: %d requests of disabled operations were not sent again.', cls.__name__, cls._saved_probes
+            )
+        cls._reset_probes()
+        super().tearDownClass()
 
     def __getattr__(self, attr_name):
-        for test_name, rest_user, operation in self.__class__.test_names:
-            if test_name == attr_name:
-                return self._get_test(rest_user, operation)
-        raise AttributeError()
\ No newline at end of file
+        if attr_name.startswith('test_'):
+            test = self.__class__.test_index.get(attr_name)
+            if test is not None:
+                return self._get_test(*test)
+        raise AttributeError(attr_name)
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+Benchmark of allowed operations of RestTestCase.
+
+In the benchmark mode every test of allowed operation sends its request `repeats` times more (after warmup,
+every request is rolled back) and measures time, number of queries and size of response. Results are written
+to JSON report at the end of the run:
+
+    {
+        "repeats": 20,
+        "results": [
+            {
+                "test_case": "app.tests.UsersTestCase", "rest_user": "admin", "operation": "list",
+                "p50": 0.0041, "p95": 0.0052, "p99": 0.0060, "queries": 3, "response_bytes": 1840,
+                "samples": [...],
+                "baseline": {"p50": 0.0032, "u": 370.0, "p_value": 0.0001, "regression": true}
+            },
+            ...
+        ],
+        "regressions": 1
+    }
+
+If a baseline report (ie. report of the main branch) is given, times of every (test case, user, operation)
+are compared with its samples by the one-sided Mann-Whitney U test and the result is a regression if the times
+are significantly greater (p-value < alpha).
+
+The mode is configured by environment variables (or by the same options of the pytest plugin):
+
+    REST_TEST_BENCHMARK=20                        # number of measured repeats, benchmark is off without it
+    REST_TEST_BENCHMARK_REPORT=benchmark.json     # path of the report
+    REST_TEST_BENCHMARK_BASELINE=baseline.json    # path of the baseline report
+    REST_TEST_BENCHMARK_ALPHA=0.01                # significance level of regressions
+"""
+import json
+import os
+
+from .stats import mann_whitney_u, percentile
+
+REPORT = 'rest_test_benchmark.json'
+ALPHA = 0.01
+PERCENTILES = (50, 95, 99)
+
+
+class Benchmark(object):
+    def __init__(self, repeats=0, report=REPORT, baseline=None, alpha=ALPHA):
+        self.repeats = repeats
+        self.report = report
+        self.baseline = baseline
+        self.alpha = alpha
+        self.results = {}
+
+    @classmethod
+    def from_environ(cls, environ=os.environ):
+        return cls(
+            repeats=int(environ.get('REST_TEST_BENCHMARK') or 0),
+            report=environ.get('REST_TEST_BENCHMARK_REPORT') or REPORT,
+            baseline=environ.get('REST_TEST_BENCHMARK_BASELINE') or None,
+            alpha=float(environ.get('REST_TEST_BENCHMARK_ALPHA') or ALPHA),
+        )
+
+    @property
+    def enabled(self):
+        return self.repeats > 0
+
+    def add(self, test_case, rest_user, operation, samples, queries, response_bytes):
+        result = {
+            'test_case': '{cls.__module__}.{cls.__qualname__}'.format(cls=type(test_case)),
+            'rest_user': rest_user.name,
+            'operation': operation,
+        }
+        for percent in PERCENTILES:
+            result['p{percent}'.format(percent=percent)] = percentile(samples, percent)
+        result.update(
+            queries=max(queries),
+            response_bytes=response_bytes,
+            samples=samples,
+        )
+        self.results[(result['test_case'], result['rest_user'], result['operation'])] = result
+        return result
+
+    def compare(self, baseline_results):
+        """
+        Compare results with results of baseline report, returns list of regressions.
+        """
+        baseline_results = {
+            (result['test_case'], result['rest_user'], result['operation']): result for result in baseline_results
+        }
+
+        regressions = []
+        for key, result in self.results.items():
+            baseline_result = baseline_results.get(key)
+            if baseline_result is None:
+                continue
+
+            u, p_value = mann_whitney_u(result['samples'], baseline_result['samples'])
+            result['baseline'] = {
+                'p50': baseline_result['p50'],
+                'u': u,
+                'p_value': p_value,
+                'regression': p_value < self.alpha,
+            }
+            if p_value < self.alpha:
+                regressions.append(result)
+        return regressions
+
+    def finish(self):
+        """
+        Compare results with the baseline and write the report, returns list of regressions.
+        """
+        if not self.enabled or not self.results:
+            return []
+
+        regressions = []
+        if self.baseline is not None:
+            with open(self.baseline) as baseline_file:
+                regressions = self.compare(json.load(baseline_file)['results'])
+
+        with open(self.report, 'w') as report_file:
+            json.dump({
+                'repeats': self.repeats,
+                'results': list(self.results.values()),
+                'regressions': len(regressions),
+            }, report_file, indent=2)
+
+        return regressions
+
+
+_benchmark = None
+
+
+def get_benchmark():
+    """
+    Benchmark of the run, configured by environment variables on the first call.
+    """
+    global _benchmark
+    if _benchmark is None:
+        _benchmark = Benchmark.from_environ()
+    return _benchmark
+
+
+def format_regression(result):
+    return "{test_case} {operation} by {rest_user}: p50 {p50:.6f}s (baseline {baseline:.6f}s, p={p_value:.4g})".format(
+        test_case=result['test_case'],
+        operation=result['operation'],
+        rest_user=result['rest_user'],
+        p50=result['p50'],
+        baseline=result['baseline']['p50'],
+        p_value=result['baseline']['p_value'],
+    )
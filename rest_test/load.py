@@ -0,0 +1,260 @@
+"""
+Load generator driven by declarations of RestTestCase.
+
+Users, urls and input data of a RestTestCase are used to send concurrent requests to a running server
+(ie. `APILiveServerTestCase.live_server_url`) by a minimal asyncio HTTP/1.1 client:
+
+    class UsersLoadTestCase(APILiveServerTestCase):
+        def test_load(self):
+            test_case = UsersTestCase()
+            test_case.setUp()  # binds users, creates data
+
+            report = run_load(test_case, self.live_server_url, concurrency=20, requests=2000)
+            print(report.format())
+
+The mix of requests is given by weights of (user name, operation), all allowed operations have the same weight
+by default. Requests are not rolled back, so ie. deleted objects are not found by next requests.
+"""
+import asyncio
+import random
+from collections import Counter
+from time import perf_counter
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.middleware.csrf import CSRF_ALLOWED_CHARS
+from django.test import Client
+from django.utils.crypto import get_random_string
+from rest_framework.renderers import JSONRenderer
+
+from .stats import percentile
+
+# HTTP method and url attribute of operations
+OPERATION_REQUESTS = {
+    'create': ('POST', 'url'),
+    'retrieve': ('GET', 'url_detail'),
+    'update': ('PUT', 'url_detail'),
+    'delete': ('DELETE', 'url_detail'),
+    'patch': ('PATCH', 'url_detail'),
+    'list': ('GET', 'url'),
+}
+
+PERCENTILES = (50, 95, 99)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def session_headers(rest_user):
+    """
+    Headers authenticating the bound user by session (with CSRF token for unsafe methods).
+    """
+    if rest_user.bound_user is None:
+        return {}
+
+    client = Client()
+    client.force_login(rest_user.bound_user)
+    csrf_token = get_random_string(32, CSRF_ALLOWED_CHARS)
+    return {
+        'Cookie': '{session_cookie}={session}; {csrf_cookie}={csrf_token}'.format(
+            session_cookie=settings.SESSION_COOKIE_NAME,
+            session=client.cookies[settings.SESSION_COOKIE_NAME].value,
+            csrf_cookie=settings.CSRF_COOKIE_NAME,
+            csrf_token=csrf_token,
+        ),
+        'X-CSRFToken': csrf_token,
+    }
+
+
+class LoadRequest(object):
+    """
+    Encoded request of an operation by a user.
+    """
+
+    def __init__(self, test_case, rest_user, operation, headers):
+        self.rest_user = rest_user
+        self.operation = operation
+        self.method, url_attr = OPERATION_REQUESTS[operation]
+
+        path = getattr(test_case, url_attr)
+        input_data = test_case._get_input_data(rest_user, operation)
+        headers = dict(headers)
+
+        body = b''
+        if input_data is not None:
+            if self.method == 'GET':
+                path = '{path}{separator}{query}'.format(
+                    path=path, separator='&' if '?' in path else '?', query=urlencode(input_data, doseq=True)
+                )
+            else:
+                body = JSONRenderer().render(input_data)
+                headers['Content-Type'] = 'application/json'
+
+        headers['Content-Length'] = str(len(body))
+        self.head = '{method} {path} HTTP/1.1\r\n{headers}\r\n\r\n'.format(
+            method=self.method,
+            path=path,
+            headers='\r\n'.join('{name}: {value}'.format(name=name, value=value) for name, value in headers.items()),
+        ).encode('latin-1')
+        self.body = body
+
+
+class _Connection(object):
+    # keep-alive connection of one worker
+    def __init__(self, host, port, ssl=False):
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.reader = None
+        self.writer = None
+
+    async def send(self, request):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+        self.writer.write(request.head + request.body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by the server.')
+        status_code = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+        else:
+            await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status_code
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class LoadReport(object):
+    def __init__(self):
+        self.latencies = {}
+        self.status_codes = {}
+        self.errors = Counter()
+        self.elapsed = 0.0
+
+    def add(self, request, latency, status_code=None):
+        key = (request.rest_user.name, request.operation)
+        self.latencies.setdefault(key, []).append(latency)
+        self.status_codes.setdefault(key, Counter())[status_code] += 1
+        if status_code is None or status_code >= 400:
+            self.errors[key] += 1
+
+    @property
+    def results(self):
+        """
+        Throughput (requests per second of the whole run), error rate and latency percentiles of (user, operation).
+        """
+        results = {}
+        for key, latencies in sorted(self.latencies.items()):
+            result = {
+                'requests': len(latencies),
+                'throughput': len(latencies) / self.elapsed if self.elapsed else 0.0,
+                'error_rate': self.errors[key] / len(latencies),
+                'status_codes': dict(self.status_codes[key]),
+            }
+            for percent in PERCENTILES:
+                result['p{percent}'.format(percent=percent)] = percentile(latencies, percent)
+            results[key] = result
+        return results
+
+    def format(self):
+        lines = ['{:<20} {:<10} {:>8} {:>10} {:>7} {:>10} {:>10} {:>10}'.format(
+            'user', 'operation', 'requests', 'req/s', 'errors', 'p50 [ms]', 'p95 [ms]', 'p99 [ms]'
+        )]
+        for (rest_user, operation), result in self.results.items():
+            lines.append('{:<20} {:<10} {:>8} {:>10.1f} {:>7.1%} {:>10.2f} {:>10.2f} {:>10.2f}'.format(
+                rest_user, operation, result['requests'], result['throughput'], result['error_rate'],
+                result['p50'] * 1000, result['p95'] * 1000, result['p99'] * 1000
+            ))
+        return '\n'.join(lines)
+
+
+def default_mix(test_case):
+    return {
+        (rest_user.name, operation): 1
+        for rest_user in type(test_case).rest_users
+        for operation in OPERATION_REQUESTS
+        if rest_user.can(operation)
+    }
+
+
+async def _worker(address, schedule, report):
+    connection = _Connection(*address)
+    try:
+        for request in schedule:
+            start = perf_counter()
+            try:
+                status_code = await connection.send(request)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                connection.close()
+                report.add(request, perf_counter() - start)
+            else:
+                report.add(request, perf_counter() - start, status_code)
+    finally:
+        connection.close()
+
+
+async def _run(address, requests, concurrency):
+    report = LoadReport()
+    # workers share the iterator, so every request is sent once
+    schedule = iter(requests)
+    start = perf_counter()
+    await asyncio.gather(*(_worker(address, schedule, report) for worker in range(concurrency)))
+    report.elapsed = perf_counter() - start
+    return report
+
+
+def _address(url):
+    # host, port and ssl of the connections, the port is given by the scheme unless it is in the url
+    if url.scheme not in DEFAULT_PORTS:
+        raise ValueError("Unsupported scheme '{scheme}' of the url.".format(scheme=url.scheme))
+    return url.hostname, url.port or DEFAULT_PORTS[url.scheme], url.scheme == 'https'
+
+
+def run_load(test_case, base_url, mix=None, concurrency=10, requests=1000, headers=session_headers, seed=None):
+    """
+    Send `requests` requests chosen by weights of `mix` {(user name, operation): weight} by `concurrency`
+    connections and return LoadReport. `headers(rest_user)` returns authentication headers of the user.
+    """
+    if mix is None:
+        mix = default_mix(test_case)
+    if not mix:
+        raise ValueError('Mix of requests is empty.')
+
+    rest_users = {rest_user.name: rest_user for rest_user in type(test_case).rest_users}
+    url = urlsplit(base_url)
+    address = _address(url)
+
+    load_requests = []
+    for rest_user_name, operation in mix:
+        rest_user = rest_users[rest_user_name]
+        user_headers = {'Host': url.netloc, 'Accept': 'application/json'}
+        user_headers.update(headers(rest_user))
+        load_requests.append(LoadRequest(test_case, rest_user, operation, user_headers))
+
+    chosen = random.Random(seed).choices(load_requests, weights=list(mix.values()), k=requests)
+    return asyncio.run(_run(address, chosen, concurrency))
@@ -0,0 +1,906 @@
+"""
+Compiled matchers for expected output data.
+
+Expected output structures (`output_*` attributes) are compiled once into a tree of matcher objects,
+so the `...` (Ellipsis) and typed wildcards are resolved only at compile time and every node can do cheap
+pre-checks (length, required keys) before descending into data.
+"""
+import gc
+import reprlib
+from collections import Counter, OrderedDict, deque
+
+from .streaming import END_ARRAY, MAP_KEY, START_ARRAY, START_MAP, build_value, iter_json_events, skip_value
+
+_MISSING = object()
+
+
+def data_type(data):
+    """
+    Type of data for comparison - subclasses of dict (ie. OrderedDict, ReturnDict) are dict and subclasses
+    of list (ie. ReturnList) are list, so the response data need not to be converted.
+    """
+    value_type = type(data)
+    if value_type is dict or value_type is list:
+        return value_type
+    elif isinstance(data, dict):
+        return dict
+    elif isinstance(data, list):
+        return list
+    return value_type
+
+
+class CompareLimitError(AssertionError):
+    """
+    Compared data exceeds maximal depth or number of compared nodes.
+    """
+
+
+class _Missing(object):
+    def __repr__(self):
+        return '<missing>'
+
+
+MISSING = _Missing()
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxstring = 80
+_repr.maxother = 80
+
+
+class Mismatch(object):
+    """
+    Mismatch of expected and actual data at the path (tuple of dict keys and list indexes).
+    """
+
+    def __init__(self, key, expected, actual, reason=None):
+        self.path = () if key is None else (key,)
+        self.expected = expected
+        self.actual = actual
+        self.reason = reason
+
+    @property
+    def pointer(self):
+        # JSON pointer (RFC 6901)
+        return ''.join('/' + str(key).replace('~', '~0').replace('/', '~1') for key in self.path)
+
+    def __str__(self):
+        if self.reason is not None:
+            detail = self.reason
+        elif self.actual is MISSING:
+            detail = 'missing, expected {expected}'.format(expected=_repr.repr(self.expected))
+        elif self.expected is MISSING:
+            detail = 'unexpected {actual}'.format(actual=_repr.repr(self.actual))
+        else:
+            detail = 'expected {expected}, got {actual}'.format(
+                expected=_repr.repr(self.expected), actual=_repr.repr(self.actual)
+            )
+        return '{pointer}: {detail}'.format(pointer=self.pointer or '/', detail=detail)
+
+    def __repr__(self):
+        return '<Mismatch {mismatch}>'.format(mismatch=self)
+
+
+def _path(node):
+    # paths of frames are linked (parent node, key) pairs, so they are not copied for every nested comparison
+    path = []
+    while node is not None:
+        node, key = node
+        path.append(key)
+    return tuple(reversed(path))
+
+
+def evaluate(steps, max_depth=None, max_nodes=None, mismatches=None, max_mismatches=None):
+    """
+    Evaluate the comparison generator (see `Matcher.steps`) with an explicit stack instead of recursion.
+
+    If `mismatches` list is given, mismatches found in the same pass are appended to it (at most
+    `max_mismatches`). Mismatches of probes (ie. searching of items in list) are not reported.
+    """
+    # every frame is [steps, path, probe, number of mismatches before the frame, matcher, data]
+    stack = [[steps, None, False, 0, None, None]]
+    nodes = 1
+    result = None
+
+    while stack:
+        frame = stack[-1]
+        try:
+            item = frame[0].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            if not result and mismatches is not None and not frame[2] and len(mismatches) == frame[3] and stack:
+                # nothing more specific was reported
+                mismatches.append(Mismatch(None, frame[4].pattern, frame[5]))
+                mismatches[-1].path = _path(frame[1])
+            if mismatches and max_mismatches is not None and len(mismatches) >= max_mismatches:
+                return False
+            continue
+
+        result = None
+        if isinstance(item, Mismatch):
+            if mismatches is not None and not frame[2]:
+                item.path = _path(frame[1]) + item.path
+                mismatches.append(item)
+                if max_mismatches is not None and len(mismatches) >= max_mismatches:
+                    # reported mismatch is not a probe, so the comparison fails anyway
+                    return False
+            continue
+
+        matcher, data, key, probe = item
+        probe = probe or frame[2]
+
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise CompareLimitError('More than {max_nodes} nodes compared.'.format(max_nodes=max_nodes))
+
+        if matcher.is_leaf:
+            result = matcher.match(data)
+            if not result and mismatches is not None and not probe:
+                mismatches.append(Mismatch(None, matcher.pattern, data))
+                mismatches[-1].path = _path((frame[1], key))
+                if max_mismatches is not None and len(mismatches) >= max_mismatches:
+                    return False
+            continue
+
+        if max_depth is not None and len(stack) >= max_depth:
+            raise CompareLimitError('Data are nested deeper than {max_depth}.'.format(max_depth=max_depth))
+
+        collect = mismatches is not None and not probe
+        stack.append([
+            matcher.steps(data, collect), (frame[1], key), probe, len(mismatches or ()), matcher, data
+        ])
+
+    return result
+
+
+class Matcher(object):
+    """
+    Base class of compiled expected data.
+    """
+
+    # leaf matchers do not descend into data
+    is_leaf = True
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    @staticmethod
+    def nested_patterns(pattern):
+        """
+        Nested patterns compiled before the matcher (see `compile_pattern`).
+        """
+        return []
+
+    def match(self, data, max_depth=None, max_nodes=None):
+        return evaluate(self.steps(data), max_depth=max_depth, max_nodes=max_nodes)
+
+    def mismatches(self, data, max_mismatches=10, max_depth=None, max_nodes=None):
+        """
+        Compare data and return list of (at most `max_mismatches`) mismatches, empty list if data match.
+        """
+        if self.is_leaf:
+            return [] if self.match(data) else [Mismatch(None, self.pattern, data)]
+
+        mismatches = []
+        result = evaluate(
+            self.steps(data, collect=True),
+            max_depth=max_depth, max_nodes=max_nodes, mismatches=mismatches, max_mismatches=max_mismatches
+        )
+        if not result and not mismatches:
+            mismatches.append(Mismatch(None, self.pattern, data))
+        return mismatches
+
+    def steps(self, data, collect=False):
+        """
+        Generator of the comparison of data - yields `(matcher, data, key, probe)` of nested comparisons,
+        receives their results and returns the result of the comparison. It could yield `Mismatch` too.
+
+        If `collect` is True, the comparison continues after the first mismatch to report more of them.
+        Leaf matchers implement only `match`.
+        """
+        raise NotImplementedError()
+
+    def accepts(self, data):
+        """
+        Cheap pre-check (fingerprint) of data - if it returns False, `match` would return False too.
+        """
+        return self.match(data)
+
+    def match_stream(self, events, event, value, last=False):
+        """
+        Match a value parsed from JSON events, `event` and `value` is the first event of the value.
+
+        When `last` is True nothing is parsed after the value, so the events could be left unconsumed.
+        """
+        return self.match(build_value(events, event, value))
+
+    def match_json(self, chunks):
+        """
+        Match JSON content (chunks of bytes or str) without building the whole data.
+        """
+        events = iter_json_events(chunks)
+        for event, value in events:
+            return self.match_stream(events, event, value, last=True)
+        raise ValueError('Empty JSON content.')
+
+    def __repr__(self):
+        return '{cls}({pattern!r})'.format(cls=self.__class__.__name__, pattern=self.pattern)
+
+
+class AnyMatcher(Matcher):
+    """
+    `...` (Ellipsis) used as a value - anything matches.
+    """
+
+    def match(self, data, max_depth=None, max_nodes=None):
+        return True
+
+
+class TypeMatcher(Matcher):
+    """
+    Typed wildcard - only type of data is tested.
+    """
+
+    def match(self, data, max_depth=None, max_nodes=None):
+        # the type is strict, only subclasses of dict and list match dict and list wildcards
+        if type(data) is self.pattern:
+            return True
+        return self.pattern in (dict, list) and data_type(data) is self.pattern
+
+
+class ValueMatcher(Matcher):
+    """
+    Any other value - type and value must be the same.
+    """
+
+    def __init__(self, pattern):
+        super().__init__(pattern)
+        self.pattern_type = type(pattern)
+
+    def match(self, data, max_depth=None, max_nodes=None):
+        return type(data) == self.pattern_type and data == self.pattern
+
+
+class DictMatcher(Matcher):
+    is_leaf = False
+
+    @staticmethod
+    def nested_patterns(pattern):
+        return [value for key, value in pattern.items() if key is not ... and value is not ...]
+
+    def __init__(self, pattern, nested=None):
+        super().__init__(pattern)
+        if nested is None:
+            nested = [compile_pattern(value) for value in self.nested_patterns(pattern)]
+
+        self.subset = False
+
+        # subset
+        if ... in pattern:
+            if pattern[...] is ...:
+                self.subset = True
+            else:
+                raise TypeError('Bad usage of ... (Ellipsis).')
+
+        self.required_keys = frozenset(key for key in pattern if key is not ...)
+        self.size = len(self.required_keys)
+
+        # keys with `...` value are checked only by required_keys
+        item_matchers = list(zip(
+            (key for key, value in pattern.items() if key is not ... and value is not ...),
+            nested
+        ))
+        self.leaf_matchers = tuple((key, matcher) for key, matcher in item_matchers if matcher.is_leaf)
+        self.nested_matchers = tuple((key, matcher) for key, matcher in item_matchers if not matcher.is_leaf)
+        # cheap scalar values first
+        self.item_matchers = self.leaf_matchers + self.nested_matchers
+        self.value_matchers = dict(item_matchers)
+
+    def accepts(self, data):
+        if data_type(data) != dict:
+            return False
+
+        if self.subset:
+            if len(data) < self.size:
+                return False
+        elif len(data) != self.size:
+            # more or less items in data
+            return False
+
+        if not data.keys() >= self.required_keys:
+            # Key is not found in data
+            return False
+
+        for key, matcher in self.leaf_matchers:
+            if not matcher.match(data[key]):
+                # values are not the same
+                return False
+
+        return True
+
+    def steps(self, data, collect=False):
+        if not self.accepts(data):
+            if collect and data_type(data) == dict:
+                yield from self._mismatches(data)
+            return False
+
+        result = True
+        for key, matcher in self.nested_matchers:
+            if not (yield matcher, data[key], key, False):
+                # values are not the same
+                if not collect:
+                    return False
+                result = False
+
+        return result
+
+    def _mismatches(self, data):
+        for key in self.required_keys - data.keys():
+            yield Mismatch(key, self.pattern[key], MISSING)
+
+        if not self.subset:
+            for key in data.keys() - self.required_keys:
+                yield Mismatch(key, MISSING, data[key])
+
+        for key, matcher in self.item_matchers:
+            if key in data:
+                yield matcher, data[key], key, False
+
+    def match_stream(self, events, event, value, last=False):
+        if event != START_MAP:
+            return False
+
+        found = 0
+        for event, key in events:
+            if event != MAP_KEY:
+                # end of map
+                break
+
+            event, value = next(events)
+            if key in self.required_keys:
+                found += 1
+                matcher = self.value_matchers.get(key)
+                if matcher is None:
+                    skip_value(events, event)
+                elif not matcher.match_stream(events, event, value):
+                    # values are not the same
+                    return False
+            elif self.subset:
+                skip_value(events, event)
+            else:
+                # more items in data
+                return False
+
+        # Key is not found in data
+        return found == self.size
+
+
+class ListMatcher(Matcher):
+    """
+    List of expected items, optionally divided by `...` (Ellipsis) into segments.
+
+    Every segment is placed at its leftmost position after the previous one. Segments are separated by ellipsis,
+    so the leftmost placement leaves most room for the following segments and no backtracking is needed.
+    Candidate positions are filtered by the cheap `accepts` check before the full comparison.
+    """
+
+    is_leaf = False
+
+    @staticmethod
+    def nested_patterns(pattern):
+        return [value for value in pattern if value is not ...]
+
+    def __init__(self, pattern, nested=None):
+        super().__init__(pattern)
+        if nested is None:
+            nested = [compile_pattern(value) for value in self.nested_patterns(pattern)]
+        nested = iter(nested)
+
+        segments = [[]]
+        previous = None
+        for value in pattern:
+            if value is ...:
+                if previous is ...:
+                    raise TypeError('Consecutively usage of ... (Ellipsis) is not allowed in list.')
+                segments.append([])
+            else:
+                segments[-1].append(next(nested))
+            previous = value
+
+        self.exact = len(segments) == 1
+        # the first segment is anchored to the start of data and the last one to the end of data
+        self.head = tuple(segments[0])
+        self.tail = tuple(segments[-1]) if not self.exact else ()
+        self.segments = tuple(tuple(segment) for segment in segments[1:-1] if segment)
+        self.min_size = sum(len(segment) for segment in segments)
+
+    def _match_at(self, data, segment, position, collect=False, probe=False):
+        items = data[position:position + len(segment)]
+        if not collect:
+            for data_item, matcher in zip(items, segment):
+                if not matcher.accepts(data_item):
+                    return False
+
+        result = True
+        for index, (data_item, matcher) in enumerate(zip(items, segment), position):
+            if matcher.is_leaf:
+                # leaf items are already checked by accepts unless mismatches are collected
+                if collect and not matcher.match(data_item):
+                    yield Mismatch(index, matcher.pattern, data_item)
+                    result = False
+            elif not (yield matcher, data_item, index, probe):
+                if not collect:
+                    return False
+                result = False
+        return result
+
+    def _find(self, data, segment, start, stop):
+        # leftmost position of the segment in data[start:stop] or -1
+        first = segment[0]
+        for position in range(start, stop - len(segment) + 1):
+            if first.accepts(data[position]) and (yield from self._match_at(data, segment, position, probe=True)):
+                return position
+        return -1
+
+    def accepts(self, data):
+        if data_type(data) != list:
+            return False
+
+        if self.exact:
+            return len(data) == self.min_size
+
+        # there are more expected items
+        return len(data) >= self.min_size
+
+    def steps(self, data, collect=False):
+        if not self.accepts(data):
+            if collect and data_type(data) == list:
+                yield Mismatch(None, self.pattern, data, 'expected {quantifier}{size} items, got {data_size}'.format(
+                    quantifier='' if self.exact else 'at least ', size=self.min_size, data_size=len(data)
+                ))
+            return False
+
+        result = yield from self._match_at(data, self.head, 0, collect)
+        if not result and not collect:
+            return False
+
+        start = len(self.head)
+        stop = len(data) - len(self.tail)
+
+        if self.tail and not (yield from self._match_at(data, self.tail, stop, collect)):
+            if not collect:
+                return False
+            result = False
+
+        for segment in self.segments:
+            position = yield from self._find(data, segment, start, stop)
+            if position < 0:
+                # expected segment is not in data
+                if collect:
+                    reason = 'expected items {items} not found after index {start}'.format(
+                        items=_repr.repr([matcher.pattern for matcher in segment]), start=start
+                    )
+                    yield Mismatch(None, self.pattern, data, reason)
+                return False
+            start = position + len(segment)
+
+        return result
+
+    def match_stream(self, events, event, value, last=False):
+        # items are built one by one, only a window of the current segment is kept in memory
+        if event != START_ARRAY:
+            return False
+
+        def next_item():
+            for event, value in events:
+                if event == END_ARRAY:
+                    break
+                return build_value(events, event, value)
+            return _MISSING
+
+        for matcher in self.head:
+            data_item = next_item()
+            if data_item is _MISSING or not matcher.match(data_item):
+                # expected item is not in data
+                return False
+
+        if self.exact:
+            # more items in data
+            return next_item() is _MISSING
+
+        window = deque()
+        for segment in self.segments:
+            while True:
+                while len(window) < len(segment):
+                    data_item = next_item()
+                    if data_item is _MISSING:
+                        # expected segment is not in data
+                        return False
+                    window.append(data_item)
+                if evaluate(self._match_at(list(window), segment, 0)):
+                    window.clear()
+                    break
+                window.popleft()
+
+        if not self.tail:
+            # last item is ellipsis, the rest of data does not matter
+            if not last:
+                skip_value(events, START_ARRAY)
+            return True
+
+        # the tail is matched against the last items of data
+        window = deque(window, maxlen=len(self.tail))
+        while True:
+            data_item = next_item()
+            if data_item is _MISSING:
+                break
+            window.append(data_item)
+
+        return len(window) == len(self.tail) and evaluate(self._match_at(list(window), self.tail, 0))
+
+
+class Unordered(object):
+    """
+    List of expected items in any order. `...` (Ellipsis) among the items means zero or more other items.
+
+        output_list = Unordered([
+            {'name': 'first'},
+            {'name': 'second', 'description': str},
+            ...
+        ])
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def __repr__(self):
+        return 'Unordered({items!r})'.format(items=self.items)
+
+
+def _is_concrete(pattern):
+    # pattern without any wildcard, so it could be compared by its canonical form
+    stack = [pattern]
+    while stack:
+        value = stack.pop()
+        if value is ... or isinstance(value, (type, Matcher, Unordered)):
+            return False
+        elif type(value) == list:
+            stack.extend(value)
+        elif type(value) == dict:
+            if ... in value:
+                return False
+            stack.extend(value.values())
+        else:
+            try:
+                hash(value)
+            except TypeError:
+                return False
+    return True
+
+
+def canonical(data, table):
+    """
+    Canonical form of data - two values have the same canonical form in the same table only if they match
+    each other exactly. Every distinct subtree is stored in the table once and replaced by its number, so
+    the canonical forms are flat and hashing them does not recurse.
+    """
+    results = []
+    stack = [(data, False)]
+
+    while stack:
+        value, expanded = stack.pop()
+        value_type = data_type(value)
+
+        if value_type != list and value_type != dict:
+            # raises TypeError for unhashable data
+            key = (value_type, value)
+        elif not expanded:
+            # canonical forms of items are computed first
+            stack.append((value, True))
+            items = value if value_type == list else value.values()
+            stack.extend((item, False) for item in reversed(list(items)))
+            continue
+        else:
+            items = tuple(results[len(results) - len(value):])
+            del results[len(results) - len(value):]
+            if value_type == list:
+                key = (list, items)
+            else:
+                key = (dict, frozenset(zip(value.keys(), items)))
+
+        results.append(table.setdefault(key, len(table)))
+
+    return results[0]
+
+
+class UnorderedMatcher(Matcher):
+    """
+    Matches items regardless of their order.
+
+    Items without wildcards are matched by their canonical form via a multiset, so identical data items are
+    interchangeable and it takes linear time. Only the remaining items with wildcards are assigned to the
+    remaining data items by bipartite matching.
+    """
+
+    is_leaf = False
+
+    @staticmethod
+    def nested_patterns(pattern):
+        return [item for item in pattern.items if item is not ... and not _is_concrete(item)]
+
+    def __init__(self, pattern, nested=None):
+        super().__init__(pattern)
+        if nested is None:
+            nested = [compile_pattern(item) for item in self.nested_patterns(pattern)]
+
+        items = [item for item in pattern.items if item is not ...]
+        self.subset = len(items) != len(pattern.items)
+        self.size = len(items)
+        self.concrete_items = tuple(item for item in items if _is_concrete(item))
+        self.wildcard_matchers = tuple(nested)
+
+    def accepts(self, data):
+        if data_type(data) != list:
+            return False
+
+        if self.subset:
+            return len(data) >= self.size
+
+        return len(data) == self.size
+
+    def steps(self, data, collect=False):
+        if not self.accepts(data):
+            if collect and data_type(data) == list:
+                yield Mismatch(None, self.pattern, data, 'expected {quantifier}{size} items, got {data_size}'.format(
+                    quantifier='at least ' if self.subset else '', size=self.size, data_size=len(data)
+                ))
+            return False
+
+        table = {}
+        concrete_items = {}
+        missing = Counter()
+        for item in self.concrete_items:
+            key = canonical(item, table)
+            concrete_items[key] = item
+            missing[key] += 1
+
+        remaining = []
+        for index, data_item in enumerate(data):
+            try:
+                key = canonical(data_item, table)
+            except TypeError:
+                key = None
+            if missing.get(key):
+                missing[key] -= 1
+            else:
+                remaining.append((index, data_item))
+
+        if +missing:
+            # some items are not in data
+            if collect:
+                for key in +missing:
+                    yield Mismatch(None, concrete_items[key], MISSING, 'expected item {item} not found'.format(
+                        item=_repr.repr(concrete_items[key])
+                    ))
+            return False
+
+        return (yield from self._assign(remaining, collect))
+
+    @staticmethod
+    def _scanned(matcher, remaining, indexes):
+        # data items scanned by the group - only items with the value of the first scalar item of a dict pattern,
+        # data items are indexed by the key of the item once for all groups
+        if isinstance(matcher, DictMatcher):
+            for key, value_matcher in matcher.leaf_matchers:
+                if not isinstance(value_matcher, ValueMatcher):
+                    continue
+
+                index = indexes.get(key)
+                if index is None:
+                    index = indexes[key] = {}
+                    for position, (_, data_item) in enumerate(remaining):
+                        if data_type(data_item) == dict and key in data_item:
+                            value = data_item[key]
+                            try:
+                                index.setdefault((type(value), value), []).append(position)
+                            except TypeError:
+                                # unhashable value is not equal to the scalar value
+                                pass
+                try:
+                    return index.get((value_matcher.pattern_type, value_matcher.pattern), ())
+                except TypeError:
+                    break
+        return range(len(remaining))
+
+    def _assign(self, remaining, collect):
+        # equal wildcard items are one group assigned to as many data items as its count, the data items are
+        # scanned by every group lazily, so each of them is compared with the pattern of the group at most once
+        groups = []  # [matcher, count]
+        group_indexes = {}
+        table = {}
+        for matcher in self.wildcard_matchers:
+            try:
+                key = (True, canonical(matcher.pattern, table))
+            except TypeError:
+                key = (False, id(matcher))
+            if key in group_indexes:
+                groups[group_indexes[key]][1] += 1
+            else:
+                group_indexes[key] = len(groups)
+                groups.append([matcher, 1])
+
+        indexes = {}
+        scanned = [self._scanned(matcher, remaining, indexes) for matcher, count in groups]
+        positions = [0] * len(groups)  # next data item scanned by the group
+        candidates = [[] for group in groups]  # data items matching the group
+        assigned = {}  # index of data item -> index of group
+
+        for group_index, (group_matcher, count) in enumerate(groups):
+            for unit in range(count):
+                # search for augmenting path, every frame is [group, position in its candidates, chosen data item]
+                visited = set()
+                frames = [[group_index, None, None]]
+                while frames:
+                    frame = frames[-1]
+                    group = frame[0]
+                    matcher = groups[group][0]
+
+                    if frame[1] is None:
+                        # new data items first, a free one ends the path
+                        while positions[group] < len(scanned[group]):
+                            index = scanned[group][positions[group]]
+                            positions[group] += 1
+                            data_index, data_item = remaining[index]
+                            if not matcher.accepts(data_item):
+                                continue
+                            if not matcher.is_leaf and not (yield matcher, data_item, data_index, True):
+                                continue
+                            candidates[group].append(index)
+                            if index not in assigned:
+                                frame[2] = index
+                                break
+                        else:
+                            frame[1] = 0
+
+                        if frame[2] is not None:
+                            for frame_group, _, index in frames:
+                                assigned[index] = frame_group
+                            break
+
+                    # try to reassign the group of a data item matching the group
+                    chosen = None
+                    while frame[1] < len(candidates[group]):
+                        index = candidates[group][frame[1]]
+                        frame[1] += 1
+                        if index not in visited and assigned[index] != group:
+                            chosen = index
+                            break
+                    if chosen is None:
+                        frames.pop()
+                        continue
+
+                    visited.add(chosen)
+                    frame[2] = chosen
+                    frames.append([assigned[chosen], None, None])
+                else:
+                    # wildcard item is not in data
+                    if collect:
+                        yield Mismatch(None, group_matcher.pattern, MISSING, 'expected item {item} not found'.format(
+                            item=_repr.repr(group_matcher.pattern)
+                        ))
+                    return False
+
+        return True
+
+
+def _matcher_class(pattern):
+    if pattern is ...:
+        return AnyMatcher
+    elif isinstance(pattern, type):
+        return TypeMatcher
+    elif isinstance(pattern, Unordered):
+        return UnorderedMatcher
+    elif type(pattern) == list:
+        return ListMatcher
+    elif type(pattern) == dict:
+        return DictMatcher
+    else:
+        return ValueMatcher
+
+
+def compile_pattern(pattern):
+    """
+    Compile expected data into a tree of matchers.
+    """
+    # matchers have no reference cycles, garbage collections of the growing tree would make the compilation
+    # of big patterns quadratic
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _compile(pattern)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _leaf_matcher(pattern, shared_leaves):
+    # compiled leaf pattern or None for nested patterns, matchers of equal leaf patterns (ie. the same value
+    # in every item of a list) are shared
+    if isinstance(pattern, Matcher):
+        return pattern
+
+    matcher_class = _matcher_class(pattern)
+    if not matcher_class.is_leaf:
+        return None
+    try:
+        key = (matcher_class, type(pattern), pattern)
+        matcher = shared_leaves.get(key)
+    except TypeError:
+        # unhashable value
+        return matcher_class(pattern)
+    if matcher is None:
+        matcher = shared_leaves[key] = matcher_class(pattern)
+    return matcher
+
+
+def _compile(pattern):
+    # without recursion - nested matchers are collected in results and passed to their parent matcher,
+    # leaf patterns are compiled right away and only nested patterns go through the stack
+    shared_leaves = {}
+    matcher = _leaf_matcher(pattern, shared_leaves)
+    if matcher is not None:
+        return matcher
+
+    results = []
+    stack = [(pattern, None)]
+
+    while stack:
+        pattern, nested = stack.pop()
+        matcher_class = _matcher_class(pattern)
+
+        if nested is None:
+            # None stands for a nested pattern compiled on the stack
+            nested_patterns = matcher_class.nested_patterns(pattern)
+            nested = [_leaf_matcher(nested_pattern, shared_leaves) for nested_pattern in nested_patterns]
+            stack.append((pattern, nested))
+            stack.extend(
+                (nested_pattern, None)
+                for nested_pattern, matcher in zip(reversed(nested_patterns), reversed(nested))
+                if matcher is None
+            )
+        else:
+            count = nested.count(None)
+            if count:
+                compiled_nested = iter(results[len(results) - count:])
+                del results[len(results) - count:]
+                nested = [next(compiled_nested) if matcher is None else matcher for matcher in nested]
+            results.append(matcher_class(pattern, nested))
+
+    return results[0]
+
+
+COMPILED_PATTERNS = 256
+
+# compiled patterns by their identity, the pattern is kept by its matcher, so its id is not reused
+_compiled = OrderedDict()
+
+
+def compiled(pattern):
+    """
+    Matcher of the pattern compiled only once for the same pattern object (the last COMPILED_PATTERNS patterns
+    are kept), so a pattern changed in place after its first use keeps its stale matcher - replace it instead.
+    """
+    if isinstance(pattern, Matcher):
+        return pattern
+
+    key = id(pattern)
+    matcher = _compiled.get(key)
+    if matcher is not None and matcher.pattern is pattern:
+        _compiled.move_to_end(key)
+        return matcher
+
+    matcher = _compiled[key] = compile_pattern(pattern)
+    if len(_compiled) > COMPILED_PATTERNS:
+        _compiled.popitem(last=False)
+    return matcher
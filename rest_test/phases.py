@@ -0,0 +1,166 @@
+"""
+Time of phases of a request.
+
+While a request is instrumented, its time is split into exclusive phases:
+
+    view - APIView.dispatch (without the other phases)
+    queryset - evaluation of querysets (QuerySet._fetch_all)
+    serializer - serializer.data (without evaluation of querysets)
+    renderer - rendering of Response content
+    middleware - the rest, ie. middlewares, url resolving and the handler
+
+so the phases sum up to the total time of the request.
+
+Fields of serializers could be instrumented too - cumulative time and number of calls of `get_attribute` and
+`to_representation` of every field are summed up by the path of the field in the serializer, ie. `author.avatar_url`
+(items of lists have no name in the path).
+"""
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+from django.db.models.query import QuerySet
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, Serializer
+from rest_framework.views import APIView
+
+PHASES = ('middleware', 'view', 'queryset', 'serializer', 'renderer')
+
+
+class PhaseTimer(object):
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        # [phase, start of its last exclusive part]
+        self.stack = []
+
+    def enter(self, phase):
+        now = perf_counter()
+        if self.stack:
+            parent = self.stack[-1]
+            self.times[parent[0]] += now - parent[1]
+        self.stack.append([phase, now])
+
+    def exit(self):
+        now = perf_counter()
+        phase, start = self.stack.pop()
+        self.times[phase] += now - start
+        if self.stack:
+            self.stack[-1][1] = now
+
+    @property
+    def total(self):
+        return sum(self.times.values())
+
+
+def _timed(timer, phase, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timer.enter(phase)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.exit()
+    return wrapper
+
+
+# (class, attribute, phase) of instrumented methods and properties
+INSTRUMENTED = (
+    (APIView, 'dispatch', 'view'),
+    (QuerySet, '_fetch_all', 'queryset'),
+    (BaseSerializer, 'data', 'serializer'),
+    (Response, 'rendered_content', 'renderer'),
+)
+
+
+@contextmanager
+def instrument():
+    """
+    Time phases of requests sent in the block, yields PhaseTimer.
+    """
+    timer = PhaseTimer()
+    originals = []
+    for cls, attr, phase in INSTRUMENTED:
+        original = cls.__dict__[attr]
+        originals.append((cls, attr, original))
+        if isinstance(original, property):
+            setattr(cls, attr, property(_timed(timer, phase, original.fget), original.fset, original.fdel))
+        else:
+            setattr(cls, attr, _timed(timer, phase, original))
+
+    timer.enter('middleware')
+    try:
+        yield timer
+    finally:
+        timer.exit()
+        for cls, attr, original in originals:
+            setattr(cls, attr, original)
+
+
+def field_path(field):
+    names = []
+    while field is not None:
+        # child of ListSerializer has no name, root serializer has None
+        if field.field_name:
+            names.append(field.field_name)
+        field = field.parent
+    return '.'.join(reversed(names))
+
+
+class FieldTimer(object):
+    def __init__(self):
+        # path -> {'time': seconds, 'calls': count}
+        self.fields = {}
+
+    def wrap(self, field):
+        # methods are wrapped on the field instance, wrapped field of a serializer used again is wrapped again
+        originals = field.__dict__.get('_rest_test_originals')
+        if originals is None:
+            originals = field._rest_test_originals = {
+                attr: getattr(field, attr) for attr in ('get_attribute', 'to_representation')
+            }
+        elif field.__dict__.get('_rest_test_timer') is self:
+            return
+
+        field._rest_test_timer = self
+        path = field_path(field)
+        for attr, method in originals.items():
+            setattr(field, attr, self._timed(path, method, count=attr == 'get_attribute'))
+
+    def _timed(self, path, method, count):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                field = self.fields.setdefault(path, {'time': 0.0, 'calls': 0})
+                field['time'] += perf_counter() - start
+                field['calls'] += count
+        return wrapper
+
+    @property
+    def results(self):
+        """
+        Fields from the most expensive, calls are counted by get_attribute (to_representation is skipped for None).
+        """
+        return dict(sorted(self.fields.items(), key=lambda item: item[1]['time'], reverse=True))
+
+
+@contextmanager
+def instrument_fields():
+    """
+    Time fields of serializers represented in the block, yields FieldTimer.
+    """
+    timer = FieldTimer()
+    readable_fields = Serializer.__dict__['_readable_fields']
+
+    def wrapped_readable_fields(serializer):
+        for field in readable_fields.fget(serializer):
+            timer.wrap(field)
+            yield field
+
+    Serializer._readable_fields = property(wrapped_readable_fields)
+    try:
+        yield timer
+    finally:
+        Serializer._readable_fields = readable_fields
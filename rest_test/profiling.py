@@ -0,0 +1,103 @@
+"""
+Profiling of generated tests of RestTestCase.
+
+Every generated test `test_{operation}_by_{user}` is run by cProfile and its stats are written to
+`{directory}/{module}.{TestCase}.{test}.prof` (see `python -m pstats` or snakeviz). At the end of the run the stats
+of all tests are aggregated and the top functions (by their own time) are written to `{directory}/summary.txt`
+and reported by RestTestRunner or the pytest plugin.
+
+The profiling is turned on by the `profile_dir` attribute of RestTestCase or for all test cases by environment
+variables (or by the same options of the pytest plugin):
+
+    REST_TEST_PROFILE=profiles     # directory of stats files
+    REST_TEST_PROFILE_TOP=30       # number of functions in the summary
+
+Stats written since the start of the run are summarized, so stats written by workers of RestTestRunner
+(`--parallel`) or of pytest-xdist are summarized by the main process.
+
+Requests of concurrent probes (see RestTestCase.disabled_probe_workers) are sent by other threads, so they are
+not profiled.
+"""
+import cProfile
+import io
+import os
+import pstats
+from glob import escape as glob_escape, glob
+from time import time
+
+TOP = 20
+
+_profilers = {}
+
+
+class Profiler(object):
+    def __init__(self, directory, top=TOP, started=None):
+        self.directory = directory
+        self.top = top
+        self.started = time() if started is None else started
+
+    def profile(self, test_case, test_name, test):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return test()
+        finally:
+            profile.disable()
+
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, '{cls.__module__}.{cls.__qualname__}.{test_name}.prof'.format(
+                cls=type(test_case), test_name=test_name
+            ))
+            profile.dump_stats(path)
+
+    @property
+    def files(self):
+        """
+        Stats files written since the start of the run (by this process or by other processes).
+        """
+        paths = glob(os.path.join(glob_escape(self.directory), '*.prof'))
+        return sorted(path for path in paths if os.path.getmtime(path) >= self.started)
+
+    def summary(self):
+        """
+        Top functions of all profiled tests, the summary is written to summary.txt too.
+        """
+        files = self.files
+        if not files:
+            return ''
+
+        output = io.StringIO()
+        output.write('{count} profiled tests in {directory}\n'.format(count=len(files), directory=self.directory))
+        stats = pstats.Stats(*files, stream=output)
+        # without the list of all files
+        stats.files = []
+        stats.sort_stats('tottime').print_stats(self.top)
+        summary = output.getvalue()
+
+        with open(os.path.join(self.directory, 'summary.txt'), 'w') as summary_file:
+            summary_file.write(summary)
+        return summary
+
+
+def get_profiler(directory=None, started=None):
+    """
+    Profiler writing to the directory (REST_TEST_PROFILE by default), None if the profiling is off. The main process
+    of parallel tests creates the profilers with the start of the run before the tests run in workers.
+    """
+    directory = directory or os.environ.get('REST_TEST_PROFILE')
+    if not directory:
+        return None
+
+    profiler = _profilers.get(directory)
+    if profiler is None:
+        profiler = _profilers[directory] = Profiler(
+            directory, int(os.environ.get('REST_TEST_PROFILE_TOP') or TOP), started
+        )
+    return profiler
+
+
+def finish():
+    """
+    Summaries of all profilers of the run.
+    """
+    return [summary for summary in (profiler.summary() for profiler in _profilers.values()) if summary]
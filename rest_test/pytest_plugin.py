@@ -0,0 +1,216 @@
+"""
+pytest plugin for tests generated by RestTestCase.
+
+Every generated test `test_{operation}_by_{user}` is collected as a separate item with markers
+`rest_operation(operation)`, `rest_user(user)` and `rest_allowed` or `rest_disabled`, so the user x operation
+matrix could be selected by `-m`, `-k` or by options:
+
+    $ pytest --rest-user admin --rest-operation list --rest-operation retrieve --rest-status allowed
+
+Options `--rest-benchmark`, `--rest-benchmark-report`, `--rest-benchmark-baseline` and `--rest-benchmark-alpha` turn on
+the benchmark mode (see rest_test.benchmark), benchmark regressions fail the run.
+
+Options `--rest-profile` and `--rest-profile-top` turn on profiling of generated tests (see rest_test.profiling).
+With pytest-xdist the workers send their profile directories to the controller, which reports one summary.
+
+Times measured by `output_max_time_{operation}[_{user}]`, `output_max_complexity_{operation}[_{user}]`,
+`phase_timing` and `field_timing` are added to user properties of the items (ie. to the JUnit XML report) as
+`rest_timing`, `rest_complexity`, `rest_phases` and `rest_field_times`.
+
+The plugin imports rest_test (and Django REST framework), so it is not registered by an entry point - add
+`pytest_plugins = ['rest_test.pytest_plugin']` to your conftest.py, which is loaded after pytest-django configured
+the settings.
+"""
+import os
+import sys
+from time import time
+
+import pytest
+
+REGRESSIONS = pytest.StashKey()
+PROFILES = pytest.StashKey()
+STARTED = pytest.StashKey()
+
+MARKERS = (
+    'rest_operation(operation): operation of generated RestTestCase test',
+    'rest_user(name): name of RestUser of generated RestTestCase test',
+    'rest_allowed: generated RestTestCase test of allowed operation',
+    'rest_disabled: generated RestTestCase test of disabled operation',
+)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('rest_test', 'django-rest-test')
+    group.addoption(
+        '--rest-operation', action='append', default=[], metavar='OPERATION',
+        help='run only generated RestTestCase tests of the operation (could be used more times)'
+    )
+    group.addoption(
+        '--rest-user', action='append', default=[], metavar='NAME',
+        help='run only generated RestTestCase tests of the RestUser (could be used more times)'
+    )
+    group.addoption(
+        '--rest-benchmark', type=int, default=None, metavar='REPEATS',
+        help='benchmark allowed operations of RestTestCase tests by REPEATS requests (run without xdist)'
+    )
+    group.addoption(
+        '--rest-benchmark-report', default=None, metavar='PATH', help='path of the benchmark report'
+    )
+    group.addoption(
+        '--rest-benchmark-baseline', default=None, metavar='PATH', help='path of the baseline benchmark report'
+    )
+    group.addoption(
+        '--rest-benchmark-alpha', type=float, default=None, metavar='ALPHA',
+        help='significance level of benchmark regressions'
+    )
+    group.addoption(
+        '--rest-profile', default=None, metavar='DIRECTORY',
+        help='write cProfile stats of generated RestTestCase tests to the directory'
+    )
+    group.addoption(
+        '--rest-profile-top', type=int, default=None, metavar='COUNT',
+        help='number of functions in the summary of profiled tests'
+    )
+    group.addoption(
+        '--rest-status', choices=('allowed', 'disabled'), default=None,
+        help='run only generated RestTestCase tests of allowed or disabled operations'
+    )
+
+
+# rest_test is configured by environment when it is used for the first time
+ENVIRON_OPTIONS = {
+    'rest_benchmark': 'REST_TEST_BENCHMARK',
+    'rest_benchmark_report': 'REST_TEST_BENCHMARK_REPORT',
+    'rest_benchmark_baseline': 'REST_TEST_BENCHMARK_BASELINE',
+    'rest_benchmark_alpha': 'REST_TEST_BENCHMARK_ALPHA',
+    'rest_profile': 'REST_TEST_PROFILE',
+    'rest_profile_top': 'REST_TEST_PROFILE_TOP',
+}
+
+
+def pytest_configure(config):
+    config.stash[STARTED] = time()
+
+    for marker in MARKERS:
+        config.addinivalue_line('markers', marker)
+
+    for option, variable in ENVIRON_OPTIONS.items():
+        value = config.getoption(option)
+        if value is not None:
+            os.environ[variable] = str(value)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    benchmark = sys.modules.get('rest_test.benchmark')
+    if benchmark is not None:
+        regressions = benchmark.get_benchmark().finish()
+        session.config.stash[REGRESSIONS] = [benchmark.format_regression(result) for result in regressions]
+        if regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    profiling = sys.modules.get('rest_test.profiling')
+    if hasattr(session.config, 'workeroutput'):
+        # pytest-xdist worker, profiles are summarized by the controller
+        if profiling is not None:
+            session.config.workeroutput['rest_profile_dirs'] = list(profiling._profilers)
+    elif profiling is not None:
+        session.config.stash[PROFILES] = profiling.finish()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # pytest-xdist controller, stats written by the worker since the start of the run are summarized
+    directories = getattr(node, 'workeroutput', {}).get('rest_profile_dirs', [])
+    if directories:
+        from rest_test import profiling
+
+        for directory in directories:
+            profiling.get_profiler(directory, node.config.stash[STARTED])
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    regressions = config.stash.get(REGRESSIONS, [])
+    if regressions:
+        terminalreporter.section('rest_test benchmark regressions', red=True)
+        for regression in regressions:
+            terminalreporter.line(regression)
+
+    for summary in config.stash.get(PROFILES, []):
+        terminalreporter.section('rest_test profile')
+        terminalreporter.write(summary)
+
+
+def pytest_itemcollected(item):
+    # rest_test is imported by the collected module already, it could not be imported before django setup
+    rest_test = sys.modules.get('rest_test')
+    cls = getattr(item, 'cls', None)
+    if rest_test is None or not isinstance(cls, type) or not issubclass(cls, rest_test.RestTestCase):
+        return
+
+    # generated tests are marked by their user, operation and status
+    test = cls.test_index.get(item.name)
+    if test is None:
+        return
+
+    rest_user, operation = test
+    allowed = rest_user.can(operation)
+
+    item.add_marker(pytest.mark.rest_operation(operation))
+    item.add_marker(pytest.mark.rest_user(rest_user.name))
+    item.add_marker(pytest.mark.rest_allowed if allowed else pytest.mark.rest_disabled)
+    item.extra_keyword_matches.update((operation, rest_user.name))
+    item.user_properties.extend((
+        ('rest_operation', operation),
+        ('rest_user', rest_user.name),
+        ('rest_allowed', allowed),
+    ))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    # measured times of the test (see RestTestCase.timing, complexity, phases and field_times) are user properties
+    testcase = getattr(item, '_testcase', None)
+    for name in ('timing', 'complexity', 'phases', 'field_times'):
+        value = getattr(testcase, name, None)
+        if value is not None:
+            item.user_properties.append(('rest_{name}'.format(name=name), value))
+
+
+def _is_selected(item, operations, users, status):
+    operation = item.get_closest_marker('rest_operation')
+    if operation is None:
+        # not generated test
+        return True
+
+    if operations and operation.args[0] not in operations:
+        return False
+
+    if users and item.get_closest_marker('rest_user').args[0] not in users:
+        return False
+
+    if status is not None and item.get_closest_marker('rest_{status}'.format(status=status)) is None:
+        return False
+
+    return True
+
+
+def pytest_collection_modifyitems(config, items):
+    operations = set(config.getoption('rest_operation'))
+    users = set(config.getoption('rest_user'))
+    status = config.getoption('rest_status')
+
+    if not operations and not users and status is None:
+        return
+
+    selected = []
+    deselected = []
+    for item in items:
+        if _is_selected(item, operations, users, status):
+            selected.append(item)
+        else:
+            deselected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
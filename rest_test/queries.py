@@ -0,0 +1,28 @@
+"""
+Templates of SQL queries - queries differing only by their parameters have the same template, so repeated
+queries (ie. N+1 queries) could be found.
+"""
+import re
+from collections import Counter
+
+# string literals, numbers (not parts of names) and lists of parameters
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+PARAMETERS = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+
+
+def sql_template(sql):
+    """
+    Replace parameters of SQL query by `?` (and lists of parameters by `(...)`).
+    """
+    template = STRING.sub('?', sql)
+    template = NUMBER.sub('?', template)
+    return PARAMETERS.sub('(...)', template)
+
+
+def repeated_templates(queries):
+    """
+    Templates of queries executed more than once with their counts, from the most repeated.
+    """
+    templates = Counter(sql_template(query['sql']) for query in queries)
+    return [(template, count) for template, count in templates.most_common() if count > 1]
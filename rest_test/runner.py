@@ -0,0 +1,69 @@
+"""
+Django test runner running test cases in a pool of processes.
+
+    TEST_RUNNER = 'rest_test.runner.RestTestRunner'
+
+Tests are distributed by TestCase classes, so the user x operation matrix of one RestTestCase (and its class
+fixtures) stays in one worker. Every worker has its own test database and results are merged into one report.
+
+In the benchmark mode (see rest_test.benchmark) tests run in one process, the report is written at the end
+and every regression is counted as a failure. Summary of profiled tests (see rest_test.profiling) of all workers
+is logged at the end too.
+"""
+import logging
+from time import time
+
+from django.test.runner import DiscoverRunner, ParallelTestSuite, get_max_test_processes
+from django.test.utils import iter_test_cases
+
+from . import profiling
+from .benchmark import format_regression, get_benchmark
+
+
+class RestParallelTestSuite(ParallelTestSuite):
+    """
+    Test cases with most tests are started first, so the workers are not waiting for the last big test case.
+    """
+
+    def __init__(self, subsuites, *args, **kwargs):
+        subsuites = sorted(subsuites, key=lambda subsuite: subsuite.countTestCases(), reverse=True)
+        super().__init__(subsuites, *args, **kwargs)
+
+
+class RestTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with one process per processor core by default (see `--parallel`).
+    """
+
+    parallel_test_suite = RestParallelTestSuite
+
+    def __init__(self, parallel=None, **kwargs):
+        if get_benchmark().enabled:
+            # benchmark results are collected in this process, measured times are not disturbed by other tests
+            parallel = 1
+        elif parallel is None or parallel == 'auto':
+            parallel = get_max_test_processes()
+        super().__init__(parallel=parallel, **kwargs)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel='auto')
+
+    def run_suite(self, suite, **kwargs):
+        # profilers of the main process summarize stats written by the workers since now
+        started = time()
+        for test in iter_test_cases(suite):
+            profiling.get_profiler(getattr(test, 'profile_dir', None), started)
+        return super().run_suite(suite, **kwargs)
+
+    def run_tests(self, *args, **kwargs):
+        failures = super().run_tests(*args, **kwargs)
+
+        regressions = get_benchmark().finish()
+        for result in regressions:
+            self.log('Benchmark regression: {regression}'.format(regression=format_regression(result)), logging.ERROR)
+
+        for summary in profiling.finish():
+            self.log(summary)
+        return failures + len(regressions)
@@ -0,0 +1,75 @@
+"""
+Statistics of measured samples.
+"""
+import math
+
+
+def percentile(samples, percent):
+    """
+    Nearest-rank percentile of samples - the smallest sample which is greater or equal to `percent` % of samples.
+    """
+    if not samples:
+        raise ValueError('Percentile of no samples.')
+    if not 0 <= percent <= 100:
+        raise ValueError('Percent {percent!r} is not in range 0-100.'.format(percent=percent))
+
+    ordered = sorted(samples)
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def mann_whitney_u(samples, baseline_samples):
+    """
+    One-sided Mann-Whitney U test that samples tend to be greater than baseline samples.
+
+    Returns U statistic of samples and p-value by the normal approximation (with tie and continuity correction),
+    which is reasonable for at least ~8 samples in both groups.
+    """
+    count, baseline_count = len(samples), len(baseline_samples)
+    if not count or not baseline_count:
+        raise ValueError('Mann-Whitney U test of no samples.')
+
+    combined = sorted([(value, True) for value in samples] + [(value, False) for value in baseline_samples])
+    total = len(combined)
+
+    # sum of ranks of samples, tied values get their average rank
+    rank_sum = 0.0
+    ties = 0
+    start = 0
+    while start < total:
+        end = start
+        while end + 1 < total and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        rank = (start + end) / 2 + 1
+        tied = end - start + 1
+        ties += tied ** 3 - tied
+        rank_sum += rank * sum(1 for value, is_sample in combined[start:end + 1] if is_sample)
+        start = end + 1
+
+    u = rank_sum - count * (count + 1) / 2
+    mean = count * baseline_count / 2
+    variance = count * baseline_count / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        # all values are the same
+        return u, 1.0
+
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def log_log_slope(sizes, values):
+    """
+    Slope of the least squares line of log(values) by log(sizes) - the exponent k of values ~ sizes ** k.
+    """
+    if len(sizes) < 2 or len(sizes) != len(values):
+        raise ValueError('Slope needs at least two sizes with their values.')
+
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in values]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        raise ValueError('Slope needs at least two different sizes.')
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
@@ -0,0 +1,262 @@
+"""
+Incremental JSON parser for comparing rendered responses without building the whole response data.
+
+The parser reads the content chunk by chunk and yields flat events:
+
+    ('start_map', None), ('map_key', key), ('end_map', None),
+    ('start_array', None), ('end_array', None), ('value', value)
+
+so the memory is bounded by the nesting depth and the size of a single token.
+"""
+import codecs
+import re
+from json.decoder import JSONDecodeError, scanstring
+from json.scanner import NUMBER_RE
+
+START_MAP = 'start_map'
+MAP_KEY = 'map_key'
+END_MAP = 'end_map'
+START_ARRAY = 'start_array'
+END_ARRAY = 'end_array'
+VALUE = 'value'
+
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_CHARS = re.compile(r'[-+.0-9eE]*')
+
+LITERALS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'NaN': float('nan'),
+    'Infinity': float('inf'),
+    '-Infinity': float('-inf'),
+}
+
+# parser states
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _AFTER_VALUE = range(5)
+
+
+def iter_chunks(content, chunk_size=CHUNK_SIZE):
+    """
+    Split rendered content into chunks without copying it.
+    """
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+class _Reader(object):
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _fill(self):
+        # append next chunk to the unread part of the buffer, returns False at the end of the content
+        if self.eof:
+            return False
+
+        text = ''
+        for chunk in self.chunks:
+            text = chunk if isinstance(chunk, str) else self.decoder.decode(chunk)
+            if text:
+                break
+        else:
+            self.eof = True
+            text = self.decoder.decode(b'', final=True)
+            if not text:
+                return False
+
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return True
+
+    def peek(self):
+        # next non-whitespace character or '' at the end of the content
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def next(self):
+        char = self.peek()
+        self.position += len(char)
+        return char
+
+    def error(self, msg):
+        return JSONDecodeError(msg, self.buffer, self.position)
+
+    def read_string(self):
+        # opening quote is already consumed
+        while True:
+            try:
+                value, self.position = scanstring(self.buffer, self.position)
+            except JSONDecodeError:
+                # string could continue in next chunk
+                if self._fill():
+                    continue
+                raise
+            return value
+
+    def read_scalar(self):
+        char = self.peek()
+
+        if char == '"':
+            self.position += 1
+            return self.read_string()
+
+        while True:
+            if NUMBER_CHARS.match(self.buffer, self.position).end() == len(self.buffer) and self._fill():
+                # number could continue in next chunk
+                continue
+
+            match = NUMBER_RE.match(self.buffer, self.position)
+
+            for literal, value in LITERALS.items():
+                end = self.position + len(literal)
+                if self.buffer.startswith(literal, self.position):
+                    self.position = end
+                    return value
+                elif literal.startswith(self.buffer[self.position:end]) and end > len(self.buffer) and self._fill():
+                    break
+            else:
+                if match is None:
+                    raise self.error('Expecting value')
+
+                integer, fraction, exponent = match.groups()
+                self.position = match.end()
+                if fraction or exponent:
+                    return float(integer + (fraction or '') + (exponent or ''))
+                return int(integer)
+
+
+def iter_json_events(chunks):
+    """
+    Parse JSON from chunks (bytes or str) into flat events.
+    """
+    reader = _Reader(chunks)
+    containers = []
+    state = _VALUE
+
+    while True:
+        if state == _VALUE:
+            char = reader.peek()
+            if char == '{':
+                reader.next()
+                containers.append(END_MAP)
+                yield START_MAP, None
+                state = _KEY_OR_END
+            elif char == '[':
+                reader.next()
+                containers.append(END_ARRAY)
+                yield START_ARRAY, None
+                state = _VALUE_OR_END
+            else:
+                yield VALUE, reader.read_scalar()
+                state = _AFTER_VALUE
+
+        elif state == _VALUE_OR_END:
+            if reader.peek() == ']':
+                reader.next()
+                yield containers.pop(), None
+                state = _AFTER_VALUE
+            else:
+                state = _VALUE
+
+        elif state == _KEY_OR_END:
+            if reader.peek() == '}':
+                reader.next()
+                yield containers.pop(), None
+                state = _AFTER_VALUE
+            else:
+                state = _KEY
+
+        elif state == _KEY:
+            if reader.next() != '"':
+                raise reader.error('Expecting property name enclosed in double quotes')
+            key = reader.read_string()
+            if reader.next() != ':':
+                raise reader.error("Expecting ':' delimiter")
+            yield MAP_KEY, key
+            state = _VALUE
+
+        else:
+            if not containers:
+                if reader.peek():
+                    raise reader.error('Extra data')
+                return
+
+            char = reader.next()
+            if char == ',':
+                state = _KEY if containers[-1] == END_MAP else _VALUE
+            elif (char == '}' and containers[-1] == END_MAP) or (char == ']' and containers[-1] == END_ARRAY):
+                yield containers.pop(), None
+            else:
+                raise reader.error("Expecting ',' delimiter")
+
+
+def build_value(events, event, value):
+    """
+    Build a value starting with the event from the following events.
+    """
+    if event == VALUE:
+        return value
+
+    if event == START_MAP:
+        root = {}
+    elif event == START_ARRAY:
+        root = []
+    else:
+        raise ValueError('Unexpected event {event!r}.'.format(event=event))
+
+    stack = [(root, None)]
+    for event, value in events:
+        container, key = stack[-1]
+
+        if event == MAP_KEY:
+            stack[-1] = (container, value)
+            continue
+        elif event in (END_MAP, END_ARRAY):
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        elif event == START_MAP:
+            item = {}
+        elif event == START_ARRAY:
+            item = []
+        else:
+            item = value
+
+        if type(container) == dict:
+            container[key] = item
+        else:
+            container.append(item)
+
+        if event in (START_MAP, START_ARRAY):
+            stack.append((item, None))
+
+    raise ValueError('Unexpected end of events.')
+
+
+def skip_value(events, event):
+    """
+    Consume events of a value starting with the event.
+    """
+    if event not in (START_MAP, START_ARRAY):
+        return
+
+    depth = 1
+    for event, value in events:
+        if event in (START_MAP, START_ARRAY):
+            depth += 1
+        elif event in (END_MAP, END_ARRAY):
+            depth -= 1
+            if not depth:
+                return
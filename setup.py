@@ -10,5 +10,5 @@ setup(
     description='Semi-automated testing for Django REST framework API',
     packages=['rest_test'],
     install_requires=["djangorestframework"],
-    test_requires=["pytest", "pytest-django"]
+    test_requires=["pytest", "pytest-django"],
 )
@@ -0,0 +1,18 @@
+from rest_test import RestTestCase
+
+
+class DisabledTest(RestTestCase):
+    """
+    All operations are disabled, so the generated tests pass with 404 for the empty url.
+    """
+    __test__ = False
+
+
+class ManualTest(RestTestCase):
+    """
+    Generated tests are not run, tests of the subclass call `_test` or the operations themselves.
+    """
+    __test__ = False
+
+    def _get_test(self, rest_user, operation):
+        return lambda: None
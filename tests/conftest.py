@@ -0,0 +1 @@
+pytest_plugins = ['rest_test.pytest_plugin']
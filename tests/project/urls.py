@@ -13,9 +13,19 @@ Including another URLconf
     1. Import the include() function: from django.conf.urls import url, include
     2. Add a URL to urlpatterns:  url(r'^blog/', include('blog.urls'))
 """
-from django.conf.urls import url
+try:
+    from django.urls import re_path as url
+except ImportError:
+    from django.conf.urls import url
 from django.contrib import admin
 
+from .views import AtomicForbiddenView, EchoView, MemberListView, UserListView
+
 urlpatterns = [
     url(r'^admin/', admin.site.urls),
+    url(r'^echo/$', EchoView.as_view()),
+    url(r'^echo/(?P<pk>[0-9]+)/$', EchoView.as_view()),
+    url(r'^users/$', UserListView.as_view()),
+    url(r'^members/$', MemberListView.as_view()),
+    url(r'^atomic/$', AtomicForbiddenView.as_view()),
 ]
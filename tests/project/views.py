@@ -0,0 +1,84 @@
+import time
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class EchoView(APIView):
+    """
+    Returns method, data, uploaded files and user of the request.
+    """
+
+    def echo(self, request, *args, **kwargs):
+        return Response({
+            'method': request.method,
+            'data': request.query_params.dict() if request.method == 'GET' else (
+                {name: value for name, value in request.data.items() if name not in request.FILES}
+                if hasattr(request.data, 'dict') else request.data
+            ),
+            'files': {name: file.read().decode() for name, file in request.FILES.items()},
+            'user': request.user.username or None,
+            'kwargs': kwargs,
+        })
+
+    get = post = put = patch = delete = echo
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('username',)
+
+
+class MemberSerializer(serializers.ModelSerializer):
+    groups = serializers.SlugRelatedField(slug_field='name', many=True, read_only=True)
+
+    class Meta:
+        model = User
+        fields = ('username', 'groups')
+
+
+class MemberListView(APIView):
+    """
+    Returns users with names of their groups, groups are prefetched only with `prefetch` parameter.
+    """
+
+    def get(self, request, *args, **kwargs):
+        users = User.objects.order_by('username')
+        if request.query_params.get('prefetch'):
+            users = users.prefetch_related('groups')
+        return Response(MemberSerializer(users, many=True).data)
+
+
+class UserListView(APIView):
+    """
+    Returns usernames of all users, creates user (only for authenticated users).
+    """
+
+    def get(self, request, *args, **kwargs):
+        return Response(UserSerializer(User.objects.order_by('username'), many=True).data)
+
+    def post(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return Response(status=403)
+        user = User.objects.create(username=request.data['username'])
+        return Response({'username': user.username}, status=201)
+
+
+class AtomicForbiddenView(APIView):
+    """
+    Rejects every request in a transaction (like a view with ATOMIC_REQUESTS).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with transaction.atomic():
+            User.objects.exists()
+            # probes in other threads start their transactions meanwhile
+            time.sleep(0.005)
+            return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        return Response(status=403)
@@ -111,5 +111,35 @@ class BasicTestCase(unittest.TestCase):
             ]
         )
 
+    def test_index(self):
+        from rest_test import RestTestCase, RestUser
+
+        class UserTest(RestTestCase):
+            another_user = RestUser
+
+        self.assertEqual(
+            UserTest.test_index['test_list_by_another_user'],
+            (UserTest.another_user, 'list')
+        )
+        self.assertIs(UserTest.test_index, UserTest.test_index)
+        self.assertTrue(callable(UserTest.test_retrieve_by_anonymous_user))
+
+        with self.assertRaises(AttributeError):
+            UserTest.test_list_by_unknown_user
+
+    def test_index_invalidation(self):
+        from rest_test import RestTestCase
+
+        class AnonymousTest(RestTestCase):
+            pass
+
+        self.assertEqual(len(self._dir_tests(AnonymousTest)), 6)
+        AnonymousTest.__test__ = False
+        self.assertEqual(self._dir_tests(AnonymousTest), [])
+
+        with self.assertRaises(AttributeError):
+            AnonymousTest.test_list_by_anonymous_user
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.test.runner import DiscoverRunner
+
+from rest_test import RestTestCase, RestUser
+from rest_test.benchmark import Benchmark, format_regression
+from rest_test.runner import RestTestRunner
+from rest_test.stats import mann_whitney_u
+
+
+class BenchmarkedTest(RestTestCase):
+    __test__ = False
+
+    logged_user = RestUser(can_list=True)
+
+    url = '/users/'
+
+    output_list = [{'username': 'logged'}]
+
+    def setUp(self):
+        self.logged_user.bind_user(User.objects.create(username='logged'))
+
+
+class MannWhitneyTestCase(unittest.TestCase):
+    def test_greater(self):
+        u, p_value = mann_whitney_u(list(range(10, 18)), list(range(1, 9)))
+        self.assertEqual(u, 64)
+        self.assertAlmostEqual(p_value, 0.00046955, places=6)
+
+    def test_less(self):
+        u, p_value = mann_whitney_u(list(range(1, 9)), list(range(10, 18)))
+        self.assertEqual(u, 0)
+        self.assertGreater(p_value, 0.99)
+
+    def test_ties(self):
+        u, p_value = mann_whitney_u([1, 1, 2, 2], [1, 2, 2, 1])
+        self.assertEqual(u, 8)
+        self.assertGreater(p_value, 0.5)
+        self.assertEqual(mann_whitney_u([3, 3], [3, 3]), (2, 1.0))
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.report = os.path.join(directory.name, 'report.json')
+        self.baseline = os.path.join(directory.name, 'baseline.json')
+
+    def test_environ(self):
+        benchmark = Benchmark.from_environ({'REST_TEST_BENCHMARK': '5', 'REST_TEST_BENCHMARK_ALPHA': '0.05'})
+        self.assertTrue(benchmark.enabled)
+        self.assertEqual((benchmark.repeats, benchmark.alpha, benchmark.baseline), (5, 0.05, None))
+        self.assertFalse(Benchmark.from_environ({}).enabled)
+
+    def test_report(self):
+        benchmark = Benchmark(repeats=4, report=self.report)
+        benchmark.add(self, RestUser(name='admin'), 'list', [0.4, 0.1, 0.2, 0.3], [2, 3, 2, 2], 100)
+        self.assertEqual(benchmark.finish(), [])
+
+        with open(self.report) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['regressions'], 0)
+        self.assertEqual(report['results'], [{
+            'test_case': 'tests.test_benchmark.BenchmarkTestCase',
+            'rest_user': 'admin',
+            'operation': 'list',
+            'p50': 0.2,
+            'p95': 0.4,
+            'p99': 0.4,
+            'queries': 3,
+            'response_bytes': 100,
+            'samples': [0.4, 0.1, 0.2, 0.3],
+        }])
+
+    def test_regression(self):
+        baseline = Benchmark(repeats=8, report=self.baseline)
+        baseline.add(self, RestUser(name='admin'), 'list', [0.01 * i for i in range(1, 9)], [1], 10)
+        baseline.add(self, RestUser(name='admin'), 'retrieve', [0.01 * i for i in range(1, 9)], [1], 10)
+        baseline.finish()
+
+        benchmark = Benchmark(repeats=8, report=self.report, baseline=self.baseline)
+        benchmark.add(self, RestUser(name='admin'), 'list', [0.1 * i for i in range(1, 9)], [1], 10)
+        benchmark.add(self, RestUser(name='admin'), 'retrieve', [0.01 * i for i in range(1, 9)], [1], 10)
+        # not in the baseline
+        benchmark.add(self, RestUser(name='admin'), 'create', [0.1 * i for i in range(1, 9)], [1], 10)
+
+        regressions = benchmark.finish()
+        self.assertEqual([result['operation'] for result in regressions], ['list'])
+        self.assertTrue(regressions[0]['baseline']['regression'])
+        self.assertTrue(format_regression(regressions[0]).startswith(
+            'tests.test_benchmark.BenchmarkTestCase list by admin: p50 0.400000s (baseline 0.040000s'
+        ))
+
+        results = {operation: result for (test_case, rest_user, operation), result in benchmark.results.items()}
+        self.assertFalse(results['retrieve']['baseline']['regression'])
+        self.assertNotIn('baseline', results['create'])
+
+
+class BenchmarkRunTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.report = os.path.join(directory.name, 'report.json')
+
+        self.benchmark = Benchmark(repeats=3, report=self.report)
+        patcher = mock.patch('rest_test.benchmark._benchmark', self.benchmark)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run(self):
+        # generated test of allowed operation records the samples, the runner writes the report at the end
+        runner = RestTestRunner(parallel=4)
+        self.assertEqual(runner.parallel, 1)
+
+        class RunTest(BenchmarkedTest):
+            logged_user = RestUser(can_list=True)
+
+        result = unittest.TestResult()
+        unittest.TestSuite([RunTest('test_list_by_logged_user')]).run(result)
+        self.assertTrue(result.wasSuccessful(), result.errors + result.failures)
+
+        [(key, measured)] = self.benchmark.results.items()
+        self.assertEqual(key[1:], ('logged_user', 'list'))
+        self.assertEqual(len(measured['samples']), 3)
+        self.assertGreater(measured['queries'], 0)
+        self.assertGreater(measured['response_bytes'], 0)
+
+        with mock.patch.object(DiscoverRunner, 'run_tests', return_value=0):
+            self.assertEqual(runner.run_tests([]), 0)
+
+        with open(self.report) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['regressions'], 0)
+        self.assertEqual(report['results'][0]['samples'], measured['samples'])
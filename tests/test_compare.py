@@ -1,5 +1,7 @@
 import unittest
-from rest_test import compare
+from collections import OrderedDict
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from rest_test import compare, Unordered
 
 
 class DictTestCase(unittest.TestCase):
@@ -631,6 +633,49 @@ class ListEllipsisTestCase(unittest.TestCase):
         expected_data = [..., 1, ...]
         assert compare(data, expected_data)
 
+    def test_end_repeated(self):
+        data = [
+            1,
+            2,
+            1
+        ]
+        expected_data = [
+            ...,
+            1
+        ]
+        assert compare(data, expected_data)
+
+    def test_multiple_repeated(self):
+        data = [
+            1,
+            3,
+            1,
+            2,
+            4
+        ]
+        expected_data = [
+            ...,
+            1,
+            2,
+            ...
+        ]
+        assert compare(data, expected_data)
+
+    def test_multiple_repeated_false(self):
+        data = [
+            1,
+            3,
+            1,
+            2
+        ]
+        expected_data = [
+            ...,
+            2,
+            1,
+            ...
+        ]
+        self.assertFalse(compare(data, expected_data))
+
 
 class CombinationEllipsisTestCase(unittest.TestCase):
 
@@ -799,5 +844,190 @@ class CombinationTypeEllipsisTestCase(unittest.TestCase):
         assert compare(data, expected_data)
 
 
+class UnorderedTestCase(unittest.TestCase):
+
+    def test_basic(self):
+        data = [
+            3,
+            1,
+            2
+        ]
+        expected_data = Unordered([
+            1,
+            2,
+            3
+        ])
+        assert compare(data, expected_data)
+
+    def test_basic_false(self):
+        data = [
+            3,
+            1,
+            1
+        ]
+        expected_data = Unordered([
+            1,
+            3,
+            3
+        ])
+        self.assertFalse(compare(data, expected_data))
+
+    def test_more_false(self):
+        data = [
+            3,
+            1,
+            2
+        ]
+        expected_data = Unordered([
+            1,
+            2
+        ])
+        self.assertFalse(compare(data, expected_data))
+
+    def test_ellipsis(self):
+        data = [
+            3,
+            1,
+            2
+        ]
+        expected_data = Unordered([
+            2,
+            ...
+        ])
+        assert compare(data, expected_data)
+
+    def test_types(self):
+        data = [
+            1,
+            True,
+            1.0
+        ]
+        expected_data = Unordered([
+            1.0,
+            1,
+            True
+        ])
+        assert compare(data, expected_data)
+        self.assertFalse(compare(data, Unordered([1, 1, 1])))
+
+    def test_deep(self):
+        data = [
+            {'a': [1, 2], 'b': 'x'},
+            {'a': [3], 'b': 'y'},
+        ]
+        expected_data = Unordered([
+            {'b': 'y', 'a': [3]},
+            {'b': 'x', 'a': [1, 2]},
+        ])
+        assert compare(data, expected_data)
+
+    def test_wildcards(self):
+        data = [
+            {'id': 1, 'name': 'first'},
+            {'id': 2, 'name': 'second'},
+            {'id': 3, 'name': 'third'},
+        ]
+        expected_data = Unordered([
+            {'id': int, 'name': ...},
+            {'id': 1, 'name': str},
+            {'id': 3, 'name': 'third'},
+        ])
+        assert compare(data, expected_data)
+
+    def test_wildcards_false(self):
+        data = [
+            {'id': 1, 'name': 'first'},
+            {'id': 2, 'name': 'second'},
+        ]
+        expected_data = Unordered([
+            {'id': 1, ...: ...},
+            {'id': 1, 'name': str},
+        ])
+        self.assertFalse(compare(data, expected_data))
+
+    def test_nested(self):
+        data = {
+            'results': [[2, 1], [4, 3]]
+        }
+        expected_data = {
+            'results': Unordered([Unordered([3, 4]), Unordered([..., 1])])
+        }
+        assert compare(data, expected_data)
+
+
+class UnorderedAssignmentTestCase(unittest.TestCase):
+
+    def test_overlapping_wildcard_first(self):
+        # the first data item fails the deep match of the first wildcard, but it is still free for the second one
+        expected_data = Unordered([{'y': [1], ...: ...}, dict])
+        assert compare([{'y': [1]}, {'y': [2]}], expected_data)
+        assert compare([{'y': [2]}, {'y': [1]}], expected_data)
+
+    def test_reassigned(self):
+        expected_data = Unordered([{'a': int, ...: ...}, {'a': int, 'b': int}])
+        assert compare([{'a': 1, 'b': 2}, {'a': 3, 'c': 4}], expected_data)
+        self.assertFalse(compare([{'a': 1, 'c': 2}, {'a': 3, 'c': 4}], expected_data))
+
+    def test_equal_wildcards(self):
+        data = [{'id': index, 'tags': [index]} for index in range(100)]
+        assert compare(data, Unordered([{'id': int, 'tags': [int]}] * 100))
+        assert compare(data, Unordered([{'id': int, 'tags': [int]}] * 50 + [...]))
+        self.assertFalse(compare(data, Unordered([{'id': int, 'tags': [int]}] * 101 + [...])))
+
+    def test_indexed_values(self):
+        data = [{'id': index, 'name': str(index)} for index in range(100)] + [{'id': True, 'name': 'x'}, {'name': 'y'}]
+        assert compare(data, Unordered([{'id': index, 'name': str} for index in reversed(range(100))] + [...]))
+        assert compare(data, Unordered([{'id': True, 'name': str}, {'name': 'y'}, ...]))
+        self.assertFalse(compare(data, Unordered([{'id': 1, 'name': str}, {'id': 1, 'name': str}, ...])))
+
+
+class MappingSequenceTestCase(unittest.TestCase):
+
+    def test_ordereddict(self):
+        data = OrderedDict([('a', 1), ('b', [1, 2])])
+        expected_data = {
+            'a': 1,
+            'b': [1, 2]
+        }
+        assert compare(data, expected_data)
+
+    def test_return_types(self):
+        data = ReturnList(
+            [
+                ReturnDict([('a', 1), ('b', ReturnList([1, 2], serializer=None))], serializer=None),
+                OrderedDict([('a', 2)]),
+            ],
+            serializer=None
+        )
+        expected_data = [
+            {
+                'a': int,
+                'b': [..., 2]
+            },
+            {
+                ...: ...
+            }
+        ]
+        assert compare(data, expected_data)
+        assert compare(data, Unordered([{'a': 2}, {'a': 1, 'b': list}]))
+
+    def test_types(self):
+        data = ReturnList([ReturnDict(serializer=None), OrderedDict(), True, 'abc'], serializer=None)
+        assert compare(data, list)
+        assert compare(data, [dict, dict, bool, str])
+        self.assertFalse(compare(data, [dict, dict, int, list]))
+
+    def test_strict_types(self):
+        assert compare(OrderedDict(a=1), OrderedDict)
+        assert compare(ReturnList([1], serializer=None), ReturnList)
+        self.assertFalse(compare({'a': 1}, OrderedDict))
+        self.assertFalse(compare([1], ReturnList))
+
+    def test_other_sequences(self):
+        self.assertFalse(compare((1, 2), list))
+        self.assertFalse(compare((1, 2), [1, 2]))
+        self.assertFalse(compare(range(2), [0, 1]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from django.contrib.auth.models import User
+
+from rest_test import RestUser
+from rest_test.stats import log_log_slope
+from tests.cases import ManualTest
+
+
+class LogLogSlopeTestCase(unittest.TestCase):
+    def test_slope(self):
+        sizes = [10, 100, 1000]
+        self.assertAlmostEqual(log_log_slope(sizes, [5, 5, 5]), 0)
+        self.assertAlmostEqual(log_log_slope(sizes, [size * 3 for size in sizes]), 1)
+        self.assertAlmostEqual(log_log_slope(sizes, [size ** 2 for size in sizes]), 2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            log_log_slope([10], [1])
+        with self.assertRaises(ValueError):
+            log_log_slope([10, 10], [1, 2])
+
+
+class ComplexityTest(ManualTest):
+    __test__ = False
+
+    url = '/users/'
+
+    def create_fixture(self, size):
+        User.objects.bulk_create([User(username='user{}'.format(number)) for number in range(size)])
+
+
+class ComplexityTestCase(ComplexityTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    output_list = []
+    complexity_sizes = (1, 10, 100)
+    # listed users are linear, the fixed cost of the request makes it even less
+    output_max_complexity_list = 'quadratic'
+
+    def test_complexity(self):
+        self._test(self.anonymous_user, 'list')
+
+        # fixtures are rolled back
+        self.assertFalse(User.objects.exists())
+        self.assertEqual(self.complexity['sizes'], [1, 10, 100])
+        self.assertEqual(len(self.complexity['times']), 3)
+        self.assertEqual(self.complexity['max_exponent'], 2.5)
+        self.assertEqual(self.complexity['operation'], 'list')
+        self.assertEqual(self.complexity['rest_user'], 'anonymous_user')
+
+
+class ExceededComplexityTestCase(ComplexityTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    output_list = []
+    complexity_sizes = (10, 100, 1000)
+    output_max_complexity_list = 'linear'
+
+    def create_fixture(self, size):
+        self.size = size
+
+    def _measure(self, operation, input_data, repeats, capture=False):
+        # quadratic time without timing
+        return [self.size ** 2 / 1e6] * repeats, [], None
+
+    def test_exceeded(self):
+        with self.assertRaises(AssertionError) as context:
+            self._test(self.anonymous_user, 'list')
+        self.assertIn(
+            'Expected time to grow at most like linear (exponent 1.50) but its exponent was 2.00.',
+            str(context.exception)
+        )
+
+    def test_unknown(self):
+        self.output_max_complexity_list = 'quadradic'
+        with self.assertRaises(ValueError) as context:
+            self._test(self.anonymous_user, 'list')
+        self.assertIn("Unknown complexity 'quadradic'", str(context.exception))
+        self.assertIn('constant, logarithmic, linear, linearithmic, quadratic, cubic', str(context.exception))
+        # nothing was timed
+        self.assertFalse(hasattr(self, 'size'))
+
+    def test_exponent(self):
+        self.output_max_complexity_list = 2
+        self._test(self.anonymous_user, 'list')
+        self.assertAlmostEqual(self.complexity['exponent'], 2)
+        self.assertEqual(self.complexity['max_exponent'], 2.5)
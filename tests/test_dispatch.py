@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+
+from tests.cases import ManualTest
+
+
+class DispatchTestCase(ManualTest):
+    direct_dispatch = True
+
+    url = '/echo/'
+    url_detail = '/echo/1/'
+
+    def test_dispatch(self):
+        response = self.create({'name': 'created'})
+        self.assertEqual(response.status_code, 200)
+        # response of the client would have the request
+        self.assertFalse(hasattr(response, 'wsgi_request'))
+        self.assertEqual(
+            response.data,
+            {'method': 'POST', 'data': {'name': 'created'}, 'files': {}, 'user': None, 'kwargs': {}}
+        )
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, (
+            b'{"method":"POST","data":{"name":"created"},"files":{},"user":null,"kwargs":{}}'
+        ))
+
+    def test_dispatch_detail(self):
+        response = self.retrieve({'page': '2'})
+        self.assertEqual(response.data['method'], 'GET')
+        self.assertEqual(response.data['data'], {'page': '2'})
+        self.assertEqual(response.data['kwargs'], {'pk': '1'})
+
+    def test_login(self):
+        self.login(User.objects.create(username='dispatched'))
+        self.assertEqual(self.patch({}).data['user'], 'dispatched')
+
+    def test_resolved_once(self):
+        self.list()
+        match = DispatchTestCase._resolved_urls[('project.urls', '/echo/')]
+        self.list()
+        self.assertIs(DispatchTestCase._resolved_urls[('project.urls', '/echo/')], match)
+
+    def test_unresolved(self):
+        # unresolvable urls are requested by the client
+        self.url = '/unknown/'
+        response = self.list()
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(hasattr(response, 'wsgi_request'))
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.renderers import JSONRenderer
+
+from tests.cases import ManualTest
+
+
+class EncodeTestCase(ManualTest):
+    encode_inputs_once = True
+
+    url = '/echo/'
+    url_detail = '/echo/1/'
+
+    input_create = {'name': 'created', 'tags': ['a', 'b']}
+
+    def test_encoded_once(self):
+        input_data = {'name': 'created', 'tags': ['a', 'b']}
+
+        with mock.patch('rest_test.JSONRenderer', wraps=JSONRenderer) as renderer:
+            first = self.create(input_data)
+            second = self.update(input_data)
+            self.assertEqual(renderer.call_count, 1)
+
+        for response in (first, second):
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['data'], {'name': 'created', 'tags': ['a', 'b']})
+        self.assertEqual(second.data['method'], 'PUT')
+
+    def test_replaced(self):
+        self.create(self.input_create)
+        self.input_create = {'name': 'replaced'}
+        self.assertEqual(self.patch(self.input_create).data['data'], {'name': 'replaced'})
+
+    def test_query(self):
+        # input data of get requests are in the query string
+        self.assertEqual(self.list({'page': '1'}).data['data'], {'page': '1'})
+
+    def test_multipart(self):
+        input_data = {'name': 'upload', 'file': SimpleUploadedFile('file.txt', b'content')}
+
+        for attempt in range(2):
+            response = self.create(input_data)
+            self.assertEqual(response.data['data'], {'name': 'upload'})
+            # the file is read only once
+            self.assertEqual(response.data['files'], {'file': 'content'})
+
+    def test_direct_dispatch(self):
+        self.direct_dispatch = True
+        response = self.create(self.input_create)
+        self.assertFalse(hasattr(response, 'wsgi_request'))
+        self.assertEqual(response.data['data'], {'name': 'created', 'tags': ['a', 'b']})
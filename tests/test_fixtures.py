@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+
+from rest_test import RestTestCase, RestUser
+
+
+class SharedFixturesTestCase(RestTestCase):
+    logged_user = RestUser(can_create=True, can_list=True)
+    anonymous_user = RestUser(can_list=True)
+
+    url = '/users/'
+
+    input_create = {'username': 'created'}
+    output_create = {'username': 'created'}
+    output_list = [{'username': 'logged'}, {'username': 'shared'}]
+
+    fixtures_created = 0
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixtures_created += 1
+        cls.logged_user.bind_user(User.objects.create(username='logged'))
+        User.objects.create(username='shared')
+
+    def test_shared(self):
+        # fixtures are created once per class, changes of generated tests (ie. created user) are rolled back
+        self.assertEqual(self.fixtures_created, 1)
+        usernames = User.objects.order_by('username').values_list('username', flat=True)
+        self.assertEqual(list(usernames), ['logged', 'shared'])
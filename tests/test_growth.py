@@ -0,0 +1,103 @@
+import unittest
+
+from django.contrib.auth.models import Group, User
+
+from rest_test import RestTestCase, RestUser
+from rest_test.queries import repeated_templates, sql_template
+from tests.cases import ManualTest
+
+
+class SqlTemplateTestCase(unittest.TestCase):
+    def test_template(self):
+        self.assertEqual(
+            sql_template(
+                'SELECT "t1"."id" FROM "t1" WHERE ("t1"."id" = 12 AND "t1"."name" = \'O\'\'Brien\' '
+                'AND "t1"."x" IN (1, 2, 3) AND "t1"."y" > -3.5) LIMIT 21'
+            ),
+            'SELECT "t1"."id" FROM "t1" WHERE ("t1"."id" = ? AND "t1"."name" = ? AND "t1"."x" IN (...) '
+            'AND "t1"."y" > ?) LIMIT ?'
+        )
+
+    def test_repeated(self):
+        queries = [{'sql': 'SELECT 1 FROM a WHERE id = {}'.format(pk)} for pk in range(3)] + [{'sql': 'SELECT b'}]
+        self.assertEqual(repeated_templates(queries), [('SELECT ? FROM a WHERE id = ?', 3)])
+
+
+class GrowthTest(RestTestCase):
+    __test__ = False
+
+    url = '/members/'
+
+    output_list = []
+
+    def create_fixture(self, size):
+        group = Group.objects.create(name='group')
+        for number in range(size):
+            User.objects.create(username='user{}'.format(number)).groups.add(group)
+
+
+class GrowthTestCase(GrowthTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    input_list = {'prefetch': 1}
+    output_max_queries_growth_list = 0
+
+
+class ExceededGrowthTestCase(GrowthTest, ManualTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    fixture_sizes = (2, 4, 8)
+    output_max_queries_growth_list = 1
+
+    def test_exceeded(self):
+        with self.assertRaises(AssertionError) as context:
+            self._test(self.anonymous_user, 'list')
+
+        message = str(context.exception)
+        self.assertIn(
+            'Expected number of queries to grow by at most 1 but it grew by 6 (size: queries {2: 3, 4: 5, 8: 9}).',
+            message
+        )
+        self.assertIn('Repeated queries of size 8:\n8x SELECT "auth_group"."id", "auth_group"."name"', message)
+        self.assertIn('WHERE "auth_user_groups"."user_id" = ?', message)
+
+
+class FailedGrowthTestCase(GrowthTest, ManualTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    fixture_sizes = (2, 4)
+    output_max_queries_growth_list = 0
+
+    def create_fixture(self, size):
+        super().create_fixture(size)
+        if size > 2:
+            self.url = '/missing/'
+
+    def test_failed(self):
+        # status codes of sized requests are asserted before their queries are compared
+        with self.assertRaises(AssertionError) as context:
+            self._test(self.anonymous_user, 'list')
+
+        message = str(context.exception)
+        self.assertIn('Fixture size: 4.', message)
+        self.assertIn("Expected response status code was '200' but got '404'.", message)
+
+
+class MissingFixtureTestCase(GrowthTest, ManualTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    output_max_queries_growth_list = 0
+
+    create_fixture = RestTestCase.create_fixture
+
+    def test_missing(self):
+        with self.assertRaises(NotImplementedError):
+            self._test(self.anonymous_user, 'list')
@@ -0,0 +1,63 @@
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from rest_framework.test import APILiveServerTestCase
+
+from rest_test import RestTestCase, RestUser
+from rest_test.load import _address, default_mix, run_load
+
+
+class LoadTest(RestTestCase):
+    __test__ = False
+
+    anonymous_user = RestUser(can_list=True)
+    logged_user = RestUser(can_list=True, can_create=True)
+
+    url = '/users/'
+
+    input_list = {'page': 1}
+    input_create = {'username': 'created'}
+
+    def setUp(self):
+        self.logged_user.bind_user(User.objects.create(username='logged'))
+
+
+class LoadTestCase(APILiveServerTestCase):
+    def setUp(self):
+        self.test_case = LoadTest()
+        self.test_case.setUp()
+
+    def test_default_mix(self):
+        self.assertEqual(default_mix(self.test_case), {
+            ('anonymous_user', 'list'): 1,
+            ('logged_user', 'list'): 1,
+            ('logged_user', 'create'): 1,
+        })
+
+    def test_load(self):
+        mix = {('anonymous_user', 'list'): 3, ('logged_user', 'list'): 1, ('anonymous_user', 'create'): 1}
+        report = run_load(self.test_case, self.live_server_url, mix=mix, concurrency=4, requests=50, seed=1)
+
+        results = report.results
+        self.assertEqual(sum(result['requests'] for result in results.values()), 50)
+        self.assertEqual(set(results), set(mix))
+        self.assertEqual(results[('anonymous_user', 'list')]['status_codes'], {
+            200: results[('anonymous_user', 'list')]['requests']
+        })
+        self.assertEqual(results[('logged_user', 'list')]['error_rate'], 0)
+        # anonymous user is not allowed to create
+        self.assertEqual(results[('anonymous_user', 'create')]['error_rate'], 1)
+        self.assertIn('anonymous_user', report.format())
+
+    def test_session(self):
+        # logged user is authenticated by session with CSRF token
+        report = run_load(self.test_case, self.live_server_url, mix={('logged_user', 'create'): 1}, requests=1)
+        self.assertEqual(report.results[('logged_user', 'create')]['status_codes'], {201: 1})
+        self.assertTrue(User.objects.filter(username='created').exists())
+
+    def test_default_port(self):
+        self.assertEqual(_address(urlsplit('http://example.com/api/')), ('example.com', 80, False))
+        self.assertEqual(_address(urlsplit('https://example.com')), ('example.com', 443, True))
+        self.assertEqual(_address(urlsplit('http://localhost:8000')), ('localhost', 8000, False))
+        with self.assertRaises(ValueError):
+            run_load(self.test_case, 'ftp://example.com')
@@ -0,0 +1,234 @@
+import unittest
+from unittest import mock
+
+from rest_test import compare, compare_mismatches, compile_pattern, convert_data, CompareLimitError, Unordered
+from rest_test import RestUser
+from rest_test.matchers import AnyMatcher, DictMatcher, ListMatcher, TypeMatcher, ValueMatcher, compiled
+from tests.cases import ManualTest
+
+
+class CompileTestCase(unittest.TestCase):
+
+    def test_tree(self):
+        matcher = compile_pattern({
+            'a': 1,
+            'b': ...,
+            'c': [..., str],
+        })
+
+        self.assertIsInstance(matcher, DictMatcher)
+        self.assertEqual(matcher.required_keys, {'a', 'b', 'c'})
+        item_matchers = dict(matcher.item_matchers)
+        self.assertNotIn('b', item_matchers)
+        self.assertIsInstance(item_matchers['a'], ValueMatcher)
+        self.assertIsInstance(item_matchers['c'], ListMatcher)
+        self.assertIsInstance(item_matchers['c'].tail[0], TypeMatcher)
+
+    def test_ellipsis(self):
+        self.assertIsInstance(compile_pattern(...), AnyMatcher)
+
+    def test_compiled(self):
+        matcher = compile_pattern([1, 2])
+        self.assertIs(compile_pattern(matcher), matcher)
+
+    def test_reuse(self):
+        matcher = compile_pattern([..., {'a': int}, ...])
+        assert matcher.match([{'a': 1}])
+        assert matcher.match([None, {'a': 2}, 'x'])
+        self.assertFalse(matcher.match([{'a': '1'}]))
+
+    def test_segments(self):
+        matcher = compile_pattern([1, ..., 2, 3, ..., 4, ..., 5])
+        self.assertEqual(len(matcher.head), 1)
+        self.assertEqual([len(segment) for segment in matcher.segments], [2, 1])
+        self.assertEqual(len(matcher.tail), 1)
+        self.assertEqual(matcher.min_size, 5)
+
+    def test_large_list(self):
+        data = [{'id': index, 'nested': {'value': index}} for index in range(50000)]
+        matcher = compile_pattern([..., {'id': 100, 'nested': dict}, ..., {'id': 49999, 'nested': {'value': 49999}}])
+        assert matcher.match(data)
+        self.assertFalse(matcher.match(data[:-1]))
+
+    def test_shared_leaves(self):
+        matcher = compile_pattern([{'id': 1, 'ok': True}, {'id': 1, 'ok': 1}])
+        first, second = (dict(item.item_matchers) for item in matcher.head)
+        self.assertIs(first['id'], second['id'])
+        # equal values of different types are not shared
+        self.assertIsNot(first['ok'], second['ok'])
+        self.assertFalse(matcher.match([{'id': 1, 'ok': True}, {'id': 1, 'ok': True}]))
+
+    def test_cached(self):
+        pattern = [{'a': int}]
+        matcher = compiled(pattern)
+        self.assertIs(compiled(pattern), matcher)
+        self.assertIs(compiled(matcher), matcher)
+        # equal pattern is another pattern
+        self.assertIsNot(compiled([{'a': int}]), matcher)
+
+        with mock.patch('rest_test.matchers.compile_pattern') as compile_mock:
+            assert compare([{'a': 1}], pattern)
+            self.assertEqual(compare_mismatches([{'a': '1'}], pattern)[0].path, (0, 'a'))
+        compile_mock.assert_not_called()
+
+    def test_bad_usage_list(self):
+        with self.assertRaises(TypeError):
+            compile_pattern([..., ..., 1])
+
+    def test_bad_usage_dict(self):
+        with self.assertRaises(TypeError):
+            compile_pattern({...: 1})
+
+
+class SharedOutputTest(ManualTest):
+    __test__ = False
+
+    first_user = RestUser(can_list=True)
+    second_user = RestUser(can_list=True)
+
+    output_list = [{'a': int}]
+
+
+class SharedOutputTestCase(unittest.TestCase):
+    def test_shared(self):
+        # output data of more users are compiled once
+        test = SharedOutputTest()
+        matcher = test._get_output_matcher(SharedOutputTest.first_user, 'list')
+        self.assertIs(test._get_output_matcher(SharedOutputTest.second_user, 'list'), matcher)
+        self.assertIs(SharedOutputTest()._get_output_matcher(SharedOutputTest.first_user, 'list'), matcher)
+
+
+def nested(depth, leaf):
+    data = leaf
+    for level in range(depth):
+        data = {'id': level, 'children': [data]}
+    return data
+
+
+class DeepTestCase(unittest.TestCase):
+
+    def test_deep(self):
+        data = nested(5000, 'leaf')
+        assert compare(data, nested(5000, 'leaf'))
+        self.assertFalse(compare(data, nested(5000, 'other')))
+
+    def test_deep_unordered(self):
+        data = [nested(5000, 'leaf'), 1]
+        assert compare(data, Unordered([1, nested(5000, 'leaf')]))
+        assert compare(data, Unordered([{'id': 4999, 'children': [{'id': int, ...: ...}]}, ...]))
+
+    def test_deep_convert(self):
+        data = nested(5000, 'leaf')
+        assert compare(convert_data(data), nested(5000, 'leaf'))
+
+    def test_max_depth(self):
+        data = nested(10, 'leaf')
+        assert compare(data, nested(10, 'leaf'), max_depth=20)
+        with self.assertRaises(CompareLimitError):
+            compare(data, nested(10, 'leaf'), max_depth=19)
+
+    def test_max_nodes(self):
+        data = [{'id': index, 'nested': {'id': index}} for index in range(100)]
+        # items are pre-filtered without nested comparison
+        assert compare(data, [..., {'id': 99, 'nested': dict}, ...], max_nodes=2)
+        with self.assertRaises(CompareLimitError):
+            compare(data, [..., {'id': int, 'nested': {'id': 99}}, ...], max_nodes=50)
+
+
+class MismatchesTestCase(unittest.TestCase):
+
+    def _mismatches(self, data, expected_data, max_mismatches=10):
+        return [str(mismatch) for mismatch in compile_pattern(expected_data).mismatches(data, max_mismatches)]
+
+    def test_match(self):
+        self.assertEqual(self._mismatches({'a': [1, {'b': 2}]}, {'a': [..., {'b': int}]}), [])
+
+    def test_dict(self):
+        mismatches = self._mismatches(
+            {'a': 1, 'b': {'c': 'x', 'd': 2}, 'e': 3},
+            {'a': 2, 'b': {'c': 'y', 'd': 2}, 'f': ...}
+        )
+        self.assertCountEqual(mismatches, [
+            '/a: expected 2, got 1',
+            "/b/c: expected 'y', got 'x'",
+            '/e: unexpected 3',
+            '/f: missing, expected Ellipsis',
+        ])
+
+    def test_type(self):
+        self.assertEqual(self._mismatches({'a': [1]}, {'a': dict}), ["/a: expected <class 'dict'>, got [1]"])
+        self.assertEqual(self._mismatches({'a': 'x'}, {'a': [1]}), ["/a: expected [1], got 'x'"])
+
+    def test_list(self):
+        self.assertEqual(self._mismatches([1, 2], [1, 2, 3]), ['/: expected 3 items, got 2'])
+        self.assertEqual(self._mismatches([1, [2, 3]], [1, [2, 4]]), ['/1/1: expected 4, got 3'])
+        self.assertEqual(
+            self._mismatches([1, 2, 3], [..., 2, 4, ...]),
+            ['/: expected items [2, 4] not found after index 0']
+        )
+
+    def test_unordered(self):
+        self.assertEqual(
+            self._mismatches([1, 2, {'a': 3}], Unordered([2, 1, {'a': str}])),
+            ["/: expected item {'a': <class 'str'>} not found"]
+        )
+        self.assertEqual(self._mismatches([1, 2], Unordered([1, 3])), ['/: expected item 3 not found'])
+
+    def test_pointer(self):
+        self.assertEqual(self._mismatches({'a/b': {'c~d': 1}}, {'a/b': {'c~d': 2}}), ['/a~1b/c~0d: expected 2, got 1'])
+
+    def test_max_mismatches(self):
+        data = [{'id': index} for index in range(100)]
+        mismatches = self._mismatches(data, [{'id': str}] * 100, max_mismatches=3)
+        self.assertEqual(mismatches, [
+            "/0/id: expected <class 'str'>, got 0",
+            "/1/id: expected <class 'str'>, got 1",
+            "/2/id: expected <class 'str'>, got 2",
+        ])
+
+    def test_same_result(self):
+        data = {'results': [{'id': index, 'tags': ['a'] * index} for index in range(10)]}
+        patterns = [
+            {'results': [..., {'id': 3, 'tags': list}, ...]},
+            {'results': [..., {'id': 3, 'tags': []}, ...]},
+            {'results': Unordered([{'id': 1, 'tags': ['a']}, ...])},
+            {'results': Unordered([{'id': int, 'tags': ['b']}, ...])},
+            {'results': [{'id': 0, ...: ...}, ..., {'id': 9, 'tags': [..., 'a']}]},
+        ]
+        for pattern in patterns:
+            matcher = compile_pattern(pattern)
+            self.assertEqual(matcher.match(data), not matcher.mismatches(data), pattern)
+
+
+class OutputMatcherTestCase(unittest.TestCase):
+
+    def test_cache(self):
+        from rest_test import RestTestCase
+
+        class CachedTest(RestTestCase):
+            output_list = [..., 1, ...]
+
+        test = CachedTest('test_list_by_anonymous_user')
+        rest_user = CachedTest.anonymous_user
+        matcher = test._get_output_matcher(rest_user, 'list')
+
+        self.assertIs(matcher.pattern, CachedTest.output_list)
+        self.assertIs(test._get_output_matcher(rest_user, 'list'), matcher)
+        self.assertIsNone(test._get_output_matcher(rest_user, 'retrieve'))
+
+    def test_replaced(self):
+        from rest_test import RestTestCase
+
+        class ReplacedTest(RestTestCase):
+            output_list = [..., 1, ...]
+
+        test = ReplacedTest('test_list_by_anonymous_user')
+        rest_user = ReplacedTest.anonymous_user
+        matcher = test._get_output_matcher(rest_user, 'list')
+
+        test.output_list = [2]
+        self.assertIsNot(test._get_output_matcher(rest_user, 'list'), matcher)
+        self.assertIs(test._get_output_matcher(rest_user, 'list').pattern, test.output_list)
+
+if __name__ == '__main__':
+    unittest.main()
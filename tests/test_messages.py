@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+from rest_test import TRUNCATED, BaseAPITestCase, bounded_data
+
+
+class MessageTest(BaseAPITestCase):
+    __test__ = False
+
+    message_max_lines = 10
+    message_max_bytes = 200
+
+    def runTest(self):
+        pass
+
+
+class MessageTestCase(unittest.TestCase):
+
+    def test_lazy(self):
+        test = MessageTest()
+        with mock.patch.object(test, 'format_message') as format_message:
+            test.assert_compare([1, 2, 3], [..., 3], 'msg')
+            test.assert_disabled(403, 'msg')
+        format_message.assert_not_called()
+
+    def test_failed(self):
+        test = MessageTest()
+        with self.assertRaises(AssertionError) as context:
+            test.assert_compare([1, 2, 3], [..., 4], 'failed message')
+
+        message = str(context.exception)
+        self.assertTrue(message.startswith('failed message\n'))
+        self.assertIn('response_data', message)
+        self.assertIn('expected_data', message)
+
+    def test_mismatches(self):
+        test = MessageTest()
+        test.message_max_lines = None
+        test.message_max_bytes = None
+        data = {'results': [{'id': index, 'name': str(index)} for index in range(1000)]}
+
+        with self.assertRaises(AssertionError) as context:
+            test.assert_compare(data, {'results': [..., {'id': 999, 'name': 'x'}]}, 'msg')
+
+        self.assertIn("/results/999/name: expected 'x', got '999'", str(context.exception))
+
+    def test_truncated_lines(self):
+        test = MessageTest()
+        with self.assertRaises(AssertionError) as context:
+            test.assert_compare([{'key': index} for index in range(100)], [], 'msg')
+
+        message = str(context.exception)
+        self.assertLessEqual(len(message.splitlines()), 12)
+        self.assertIn('truncated', message)
+
+    def test_truncated_bytes(self):
+        test = MessageTest()
+        message = test.truncate_message('é' * 1000)
+        self.assertIn('truncated (0 lines, 1800 bytes)', message)
+        self.assertTrue(message.startswith('é' * 100 + '\n'))
+
+    def test_unlimited(self):
+        test = MessageTest()
+        test.message_max_lines = None
+        test.message_max_bytes = None
+        self.assertEqual(test.truncate_message('x\n' * 1000), 'x\n' * 1000)
+
+    def test_deep(self):
+        test = MessageTest()
+        data, expected_data = 'x', 'y'
+        for level in range(5000):
+            data, expected_data = {'c': [data]}, {'c': [expected_data]}
+
+        with self.assertRaises(AssertionError) as context:
+            test.assert_compare(data, expected_data, 'msg')
+        self.assertIn('/c/0/c/0', str(context.exception))
+        self.assertIn('<...>', str(context.exception))
+
+    def test_bounded_data(self):
+        self.assertEqual(bounded_data({'a': [1, {'b': [2]}]}, max_depth=2), {'a': [1, TRUNCATED]})
+        self.assertEqual(bounded_data(list(range(100)), max_nodes=4), [0, 1, 2, TRUNCATED])
+        self.assertEqual(bounded_data({'a': 1, 'b': 2, 'c': 3}, max_nodes=3), {'a': 1, 'b': 2, TRUNCATED: TRUNCATED})
+        self.assertEqual(bounded_data(range(3)), range(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.db.models.query import QuerySet
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, Serializer
+from rest_framework.views import APIView
+
+from rest_test import RestUser
+from rest_test.phases import PHASES, PhaseTimer, instrument, instrument_fields
+from tests.cases import ManualTest
+
+
+class PhaseTimerTestCase(unittest.TestCase):
+    def test_exclusive(self):
+        timer = PhaseTimer()
+        with mock.patch('rest_test.phases.perf_counter', side_effect=[0, 1, 3, 6, 10]):
+            timer.enter('middleware')
+            timer.enter('view')
+            timer.enter('queryset')
+            timer.exit()
+            timer.exit()
+        expected_times = dict.fromkeys(PHASES, 0.0)
+        # middleware is not exited yet
+        expected_times.update(middleware=1, view=2 + 4, queryset=3)
+        self.assertEqual(timer.times, expected_times)
+
+    def test_restored(self):
+        originals = [APIView.dispatch, QuerySet.__dict__['_fetch_all'], BaseSerializer.data, Response.rendered_content]
+        with instrument():
+            self.assertIsNot(APIView.dispatch, originals[0])
+        self.assertEqual(
+            [APIView.dispatch, QuerySet.__dict__['_fetch_all'], BaseSerializer.data, Response.rendered_content],
+            originals
+        )
+
+
+class PhasesTestCase(ManualTest):
+    anonymous_user = RestUser(can_list=True)
+
+    phase_timing = True
+
+    url = '/users/'
+
+    output_list = [{'username': 'user'}]
+
+    def setUp(self):
+        User.objects.create(username='user')
+
+    def test_phases(self):
+        self._test(self.anonymous_user, 'list')
+
+        phases = self.phases
+        self.assertEqual((phases['operation'], phases['rest_user']), ('list', 'anonymous_user'))
+        for phase in PHASES:
+            self.assertGreater(phases[phase], 0, phase)
+        self.assertAlmostEqual(sum(phases[phase] for phase in PHASES), phases['total'])
+
+
+class GroupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ('name',)
+
+
+class MemberSerializer(serializers.ModelSerializer):
+    groups = GroupSerializer(many=True)
+    display_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ('username', 'groups', 'display_name')
+
+    def get_display_name(self, user):
+        return user.username.title()
+
+
+class FieldTimerTestCase(TestCase):
+    def setUp(self):
+        group = Group.objects.create(name='group')
+        for username in ('first', 'second'):
+            User.objects.create(username=username).groups.add(group)
+
+    def test_fields(self):
+        with instrument_fields() as timer:
+            data = MemberSerializer(User.objects.order_by('username'), many=True).data
+        self.assertEqual(data[0], {'username': 'first', 'groups': [{'name': 'group'}], 'display_name': 'First'})
+
+        self.assertEqual(
+            {path: field['calls'] for path, field in timer.results.items()},
+            {'username': 2, 'groups': 2, 'groups.name': 2, 'display_name': 2}
+        )
+        # time of nested fields is included
+        self.assertGreaterEqual(timer.results['groups']['time'], timer.results['groups.name']['time'])
+        self.assertEqual(list(timer.results)[0], 'groups')
+
+    def test_restored(self):
+        readable_fields = Serializer.__dict__['_readable_fields']
+        with instrument_fields():
+            self.assertIsNot(Serializer.__dict__['_readable_fields'], readable_fields)
+        self.assertIs(Serializer.__dict__['_readable_fields'], readable_fields)
+
+    def test_serializer_used_again(self):
+        serializer = MemberSerializer(User.objects.order_by('username'), many=True)
+        with instrument_fields():
+            serializer.data
+        with instrument_fields() as timer:
+            serializer.to_representation(User.objects.all())
+        self.assertEqual(timer.results['username']['calls'], 2)
+
+
+class FieldTimingTestCase(ManualTest):
+    anonymous_user = RestUser(can_list=True)
+
+    field_timing = True
+
+    url = '/users/'
+
+    output_list = [{'username': 'user'}]
+
+    def setUp(self):
+        User.objects.create(username='user')
+
+    def test_field_times(self):
+        self._test(self.anonymous_user, 'list')
+        self.assertEqual(list(self.field_times), ['username'])
+        self.assertEqual(self.field_times['username']['calls'], 1)
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from rest_test import RestUser
+from tests.cases import DisabledTest
+
+
+class PluginTest(DisabledTest):
+    another_user = RestUser
+
+
+def _items(request):
+    return {item.name: item for item in request.session.items if item.cls is PluginTest}
+
+
+def test_collected(request):
+    for name, item in _items(request).items():
+        rest_user, operation = PluginTest.test_index[name]
+        assert item.get_closest_marker('rest_operation').args == (operation,)
+        assert item.get_closest_marker('rest_user').args == (rest_user.name,)
+
+
+def test_markers(request):
+    item = _items(request)['test_list_by_another_user']
+
+    assert item.get_closest_marker('rest_operation').args == ('list',)
+    assert item.get_closest_marker('rest_user').args == ('another_user',)
+    assert item.get_closest_marker('rest_disabled') is not None
+    assert item.get_closest_marker('rest_allowed') is None
+    assert {'list', 'another_user'} <= item.extra_keyword_matches
+    assert ('rest_allowed', False) in item.user_properties
+
+
+def test_xdist_profiles(tmp_path, monkeypatch):
+    from rest_test import profiling
+    from rest_test.pytest_plugin import STARTED, pytest_sessionfinish, pytest_testnodedown
+
+    directory = str(tmp_path)
+    monkeypatch.setattr(profiling, '_profilers', {directory: profiling.Profiler(directory)})
+
+    # worker sends its directories instead of summary
+    worker_config = SimpleNamespace(workeroutput={}, stash={})
+    pytest_sessionfinish(SimpleNamespace(config=worker_config), 0)
+    assert worker_config.workeroutput == {'rest_profile_dirs': [directory]}
+
+    # controller summarizes stats written since its start
+    monkeypatch.setattr(profiling, '_profilers', {})
+    node = SimpleNamespace(workeroutput=worker_config.workeroutput, config=SimpleNamespace(stash={STARTED: 123.0}))
+    pytest_testnodedown(node, None)
+    assert profiling._profilers[directory].started == 123.0
@@ -0,0 +1,194 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.core.signals import request_started
+from django.test import TestCase
+
+from rest_framework.response import Response
+
+from rest_test import RestTestCase, RestUser
+
+
+class ProbeTest(RestTestCase):
+    """
+    Disabled operations are probed with input data of allowed users, the requests return 404 for the empty url.
+    """
+    __test__ = False
+
+    disabled_probe_workers = 3
+
+    first_user = RestUser(can_list=True)
+    second_user = RestUser(can_list=True)
+    third_user = RestUser(can_list=True)
+
+    input_list_first_user = {'page': 1}
+    input_list_second_user = {'page': 2}
+    input_list_third_user = {'page': 2}
+
+    def setUp(self):
+        self.client = self.client_class()
+        self.probes = []
+
+    def list(self, input_data=None):
+        # users created in the test transaction are visible in the probe threads
+        self.probes.append((input_data, threading.get_ident(), User.objects.filter(username='probe').exists()))
+        return super().list(input_data)
+
+
+class AtomicProbeTest(RestTestCase):
+    __test__ = False
+
+    disabled_probe_workers = 8
+
+    url = '/atomic/'
+
+    first_user = RestUser(can_list=True)
+    second_user = RestUser(can_list=True)
+    third_user = RestUser(can_list=True)
+    fourth_user = RestUser(can_list=True)
+
+    input_list_first_user = {'page': 1}
+    input_list_second_user = {'page': 2}
+    input_list_third_user = {'page': 3}
+    input_list_fourth_user = {'page': 4}
+
+    def setUp(self):
+        self.client = self.client_class()
+
+
+class MemoizedProbeTest(ProbeTest):
+    __test__ = False
+
+    disabled_probe_workers = None
+    memoize_probes = True
+
+    first_user = RestUser(can_list=True)
+    second_user = RestUser(can_list=True)
+    third_user = RestUser(can_list=True)
+
+
+class AllowedProbeTest(MemoizedProbeTest):
+    __test__ = False
+
+    first_user = RestUser(can_list=True)
+
+    def list(self, input_data=None):
+        self.probes.append(input_data)
+        return Response(status=200)
+
+
+class ProbeTestCase(TestCase):
+    def setUp(self):
+        User.objects.create(username='probe')
+        self.probe_test = ProbeTest()
+        self.probe_test.setUp()
+
+    def test_concurrent(self):
+        self.probe_test._test_disabled(ProbeTest.anonymous_user, 'list')
+        probes = self.probe_test.probes
+
+        self.assertCountEqual([input_data for input_data, thread, visible in probes], [None, {'page': 1}, {'page': 2}])
+        self.assertTrue(all(visible for input_data, thread, visible in probes))
+        self.assertNotIn(threading.get_ident(), [thread for input_data, thread, visible in probes])
+
+    def test_sequential(self):
+        self.probe_test.disabled_probe_workers = None
+        self.probe_test._test_disabled(ProbeTest.anonymous_user, 'list')
+        probes = self.probe_test.probes
+
+        self.assertEqual([input_data for input_data, thread, visible in probes], [None, {'page': 1}, {'page': 2}])
+        self.assertEqual({thread for input_data, thread, visible in probes}, {threading.get_ident()})
+
+
+class AtomicProbeTestCase(TestCase):
+    def test_atomic_view(self):
+        # savepoints of concurrent probes are not mixed up
+        for attempt in range(5):
+            probe_test = AtomicProbeTest()
+            probe_test.setUp()
+            probe_test._test_disabled(AtomicProbeTest.anonymous_user, 'list')
+
+    def test_no_request_signals(self):
+        # the test client toggles the close_old_connections receiver, probes are dispatched to the view instead
+        started = []
+
+        def receiver(**kwargs):
+            started.append(threading.get_ident())
+
+        request_started.connect(receiver)
+        try:
+            probe_test = AtomicProbeTest()
+            probe_test.setUp()
+            probe_test._test_disabled(AtomicProbeTest.anonymous_user, 'list')
+        finally:
+            request_started.disconnect(receiver)
+        self.assertEqual(started, [])
+
+
+class MemoizedProbeTestCase(TestCase):
+    def _probe_test(self, cls):
+        probe_test = cls()
+        probe_test.setUp()
+        return probe_test
+
+    def _fresh(self, cls):
+        # memoized probes are state of the class, every test uses its own subclass
+        class FreshProbeTest(cls):
+            __test__ = False
+
+            first_user = RestUser(can_list=True)
+            second_user = RestUser(can_list=True)
+            third_user = RestUser(can_list=True)
+
+        return FreshProbeTest
+
+    def test_memoized(self):
+        cls = self._fresh(MemoizedProbeTest)
+        cls.setUpClass()
+        first = self._probe_test(cls)
+        first._test_disabled(cls.anonymous_user, 'list')
+        self.assertEqual(len(first.probes), 3)
+
+        # rejected probes are not sent again in other tests of the class
+        second = self._probe_test(cls)
+        second._test_disabled(cls.anonymous_user, 'list')
+        self.assertEqual(second.probes, [])
+        self.assertEqual(cls._saved_probes, 3)
+
+        # another url means another request
+        third = self._probe_test(cls)
+        third.url = '/another/'
+        third._test_disabled(cls.anonymous_user, 'list')
+        self.assertEqual(len(third.probes), 3)
+
+        with self.assertLogs('rest_test', 'INFO') as logs:
+            cls.tearDownClass()
+        self.assertEqual(logs.output, [
+            'INFO:rest_test:FreshProbeTest: 3 requests of disabled operations were not sent again.'
+        ])
+        self.assertEqual((cls._rejected_probes, cls._saved_probes), (set(), 0))
+
+    def test_reset(self):
+        cls = self._fresh(MemoizedProbeTest)
+        self._probe_test(cls)._test_disabled(cls.anonymous_user, 'list')
+        self.assertEqual(len(cls._rejected_probes), 3)
+
+        # the next run of the class sends the probes again
+        cls.setUpClass()
+        try:
+            self.assertEqual((cls._rejected_probes, cls._saved_probes), (set(), 0))
+            probe_test = self._probe_test(cls)
+            probe_test._test_disabled(cls.anonymous_user, 'list')
+            self.assertEqual(len(probe_test.probes), 3)
+        finally:
+            cls.tearDownClass()
+
+    def test_allowed_not_memoized(self):
+        cls = self._fresh(AllowedProbeTest)
+        for attempt in range(2):
+            probe_test = self._probe_test(cls)
+            with self.assertRaises(AssertionError):
+                probe_test._test_disabled(cls.anonymous_user, 'list')
+            self.assertEqual(probe_test.probes, [None])
+
+        self.assertEqual(cls._saved_probes, 0)
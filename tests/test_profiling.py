@@ -0,0 +1,54 @@
+import os
+import pstats
+import tempfile
+
+from rest_test import profiling
+from rest_test.profiling import Profiler, get_profiler
+from tests.cases import DisabledTest
+
+
+class ProfilingTestCase(DisabledTest):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # profiler of removed directory is not summarized at the end of the run
+        self.addCleanup(profiling._profilers.pop, self.directory, None)
+
+    def test_profile(self):
+        self.profile_dir = self.directory
+        self.test_list_by_anonymous_user()
+        self.test_create_by_anonymous_user()
+
+        names = sorted(os.listdir(self.directory))
+        self.assertEqual(names, [
+            'tests.test_profiling.ProfilingTestCase.test_create_by_anonymous_user.prof',
+            'tests.test_profiling.ProfilingTestCase.test_list_by_anonymous_user.prof',
+        ])
+        stats = pstats.Stats(os.path.join(self.directory, names[1]))
+        self.assertIn('_test_disabled', {function for filename, line, function in stats.stats})
+
+        summary = get_profiler(self.directory).summary()
+        self.assertTrue(summary.startswith('2 profiled tests in {directory}\n'.format(directory=self.directory)))
+        with open(os.path.join(self.directory, 'summary.txt')) as summary_file:
+            self.assertEqual(summary_file.read(), summary)
+
+    def test_other_processes(self):
+        # stats written before the start of the run are not summarized
+        Profiler(self.directory).profile(self, 'test_old', lambda: None)
+        old_path = os.path.join(self.directory, 'tests.test_profiling.ProfilingTestCase.test_old.prof')
+        os.utime(old_path, (0, 0))
+
+        profiler = get_profiler(self.directory)
+        # profiler of a worker writes to the same directory
+        Profiler(self.directory).profile(self, 'test_worker', lambda: None)
+
+        self.assertEqual(profiler.files, [
+            os.path.join(self.directory, 'tests.test_profiling.ProfilingTestCase.test_worker.prof')
+        ])
+        self.assertTrue(profiler.summary().startswith('1 profiled tests in'))
+
+    def test_off(self):
+        self.assertIsNone(get_profiler(None))
+        self.test_list_by_anonymous_user()
+        self.assertEqual(os.listdir(self.directory), [])
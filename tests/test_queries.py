@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+
+from rest_test import RestTestCase, RestUser
+
+
+class QueriesTest(RestTestCase):
+    __test__ = False
+
+    url = '/users/'
+
+    output_list = [{'username': 'first'}, {'username': 'second'}]
+
+    def setUp(self):
+        User.objects.create(username='first')
+        User.objects.create(username='second')
+
+
+class QueriesTestCase(QueriesTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    output_max_queries_list = 1
+
+
+class UserQueriesTestCase(QueriesTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    # budget of the user is used instead of the budget of the operation
+    output_max_queries_list = 0
+    output_max_queries_list_anonymous_user = 1
+
+
+class ExceededQueriesTestCase(QueriesTest):
+    __test__ = True
+
+    anonymous_user = RestUser(can_list=True)
+
+    output_max_queries_list = 0
+
+    def _get_test(self, rest_user, operation):
+        test = super()._get_test(rest_user, operation)
+        if operation != 'list':
+            return test
+
+        def exceeded():
+            with self.assertRaises(AssertionError) as context:
+                test()
+            message = str(context.exception)
+            self.assertIn('Expected at most 0 queries but 1 were executed:\n1. SELECT "auth_user"."id"', message)
+            self.assertIn('FROM "auth_user" ORDER BY "auth_user"."username" ASC', message)
+        return exceeded
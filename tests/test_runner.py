@@ -0,0 +1,50 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from django.test import TestCase
+from django.test.runner import DiscoverRunner, get_max_test_processes
+
+from rest_test import RestUser, profiling
+from rest_test.runner import RestParallelTestSuite, RestTestRunner
+from tests.cases import DisabledTest
+
+
+class RunnerTest(DisabledTest):
+    another_user = RestUser
+
+
+class RestTestRunnerTestCase(TestCase):
+    def test_parallel(self):
+        self.assertEqual(RestTestRunner().parallel, get_max_test_processes())
+        self.assertEqual(RestTestRunner(parallel='auto').parallel, get_max_test_processes())
+        self.assertEqual(RestTestRunner(parallel=3).parallel, 3)
+
+    def test_biggest_first(self):
+        small = unittest.TestSuite([RunnerTest('test_list_by_anonymous_user')])
+        big = unittest.TestSuite([RunnerTest(name) for name in RunnerTest.test_index])
+
+        suite = RestParallelTestSuite([small, big], 2)
+        self.assertEqual(suite.subsuites, [big, small])
+
+    def test_profilers(self):
+        # profilers are created by the main process before the tests run in workers
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        self.addCleanup(profiling._profilers.pop, directory, None)
+
+        with mock.patch.dict(os.environ, {'REST_TEST_PROFILE': directory}), \
+                mock.patch.object(DiscoverRunner, 'run_suite') as run_suite:
+            RestTestRunner(parallel=1).run_suite(unittest.TestSuite([RunnerTest('test_list_by_anonymous_user')]))
+
+        run_suite.assert_called_once()
+        self.assertIn(directory, profiling._profilers)
+
+    def test_pickle(self):
+        # tests are sent to the workers pickled
+        test = pickle.loads(pickle.dumps(RunnerTest('test_list_by_another_user')))
+        self.assertIs(type(test), RunnerTest)
+        self.assertEqual(test._testMethodName, 'test_list_by_another_user')
+        self.assertTrue(callable(getattr(test, test._testMethodName)))
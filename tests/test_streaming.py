@@ -0,0 +1,98 @@
+import json
+import unittest
+from rest_test import compare, compare_json, Unordered
+from rest_test.streaming import build_value, iter_json_events
+
+
+def byte_chunks(content):
+    return (content[index:index + 1] for index in range(len(content)))
+
+
+class EventsTestCase(unittest.TestCase):
+
+    data = {
+        'a': [1, -2.5, 3e2, True, False, None, '', 'x"\\u00e9\u00e9\\n'],
+        'b': {'c': [], 'd': {}, 'e': [{'f': [[1], [2, [3]]]}]},
+        'long_string': 'abc' * 100,
+        'long_number': 12345678901234567890,
+    }
+
+    def test_events(self):
+        content = json.dumps(self.data)
+        events = iter_json_events([content])
+        self.assertEqual(next(events), ('start_map', None))
+        self.assertEqual(next(events), ('map_key', 'a'))
+        self.assertEqual(next(events), ('start_array', None))
+        self.assertEqual(next(events), ('value', 1))
+
+    def test_build(self):
+        content = json.dumps(self.data, indent=2)
+        events = iter_json_events([content])
+        event, value = next(events)
+        self.assertEqual(build_value(events, event, value), json.loads(content))
+
+    def test_chunks(self):
+        content = json.dumps(self.data, ensure_ascii=False).encode('utf-8')
+        events = iter_json_events(byte_chunks(content))
+        event, value = next(events)
+        self.assertEqual(build_value(events, event, value), json.loads(content))
+
+    def test_scalar(self):
+        for content in ('1', '"x"', 'null', 'true', ' 2.5 '):
+            events = iter_json_events(byte_chunks(content.encode()))
+            self.assertEqual(list(events), [('value', json.loads(content))])
+
+    def test_invalid(self):
+        for content in ('[1, 2', '{"a" 1}', '[1 2]', '[1] 2', 'nul'):
+            with self.assertRaises(ValueError):
+                list(iter_json_events([content]))
+
+
+class CompareJsonTestCase(unittest.TestCase):
+
+    data = {
+        'count': 3,
+        'results': [
+            {'id': 1, 'name': 'first', 'tags': ['a', 'b']},
+            {'id': 2, 'name': 'second', 'tags': []},
+            {'id': 3, 'name': 'third', 'tags': ['c']},
+        ]
+    }
+
+    patterns = [
+        {'count': 3, 'results': list},
+        {'count': int, ...: ...},
+        {'count': 3},
+        {'count': 3, 'results': list, 'next': ...},
+        {'count': 3, 'results': [..., {'id': 2, ...: ...}, ...]},
+        {'count': 3, 'results': [{'id': 1, ...: ...}, ...]},
+        {'count': 3, 'results': [..., {'id': 3, ...: ...}]},
+        {'count': 3, 'results': [..., {'id': 1, ...: ...}]},
+        {'count': 3, 'results': [..., {'id': int, 'name': str, 'tags': []}, ..., {'id': 3, ...: ...}]},
+        {'count': 3, 'results': [..., {'id': 2, ...: ...}, {'id': 3, ...: ...}, ...]},
+        {'count': 3, 'results': [..., {'id': 3, ...: ...}, {'id': 2, ...: ...}, ...]},
+        {'count': 3, 'results': [dict, dict, dict]},
+        {'count': 3, 'results': [dict, dict]},
+        {'count': 3, 'results': Unordered([..., {'id': 3, 'name': str, 'tags': list}])},
+        {'results': ..., ...: ...},
+        [...],
+    ]
+
+    def test_same_as_compare(self):
+        content = json.dumps(self.data).encode('utf-8')
+        for pattern in self.patterns:
+            self.assertEqual(
+                compare_json(byte_chunks(content), pattern),
+                compare(self.data, pattern),
+                pattern
+            )
+
+    def test_early_stop(self):
+        # the rest of the content is not parsed when the prefix is satisfied
+        content = '[1, 2, 3, {"broken": '
+        assert compare_json(content, [1, 2, ...])
+        assert compare_json(content, [..., 2, ...])
+        self.assertFalse(compare_json(content, [1, 3, ...]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from django.contrib.auth.models import User
+
+from rest_test import RestUser
+from rest_test.stats import percentile
+from tests.cases import ManualTest
+
+
+class PercentileTestCase(unittest.TestCase):
+    def test_percentile(self):
+        samples = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(samples, 0), 1)
+        self.assertEqual(percentile(samples, 50), 3)
+        self.assertEqual(percentile(samples, 90), 5)
+        self.assertEqual(percentile(samples, 100), 5)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+        with self.assertRaises(ValueError):
+            percentile([1], 101)
+
+
+class TimingTestCase(ManualTest):
+    logged_user = RestUser(can_create=True, can_list=True)
+
+    url = '/users/'
+
+    input_create = {'username': 'created'}
+    output_create = {'username': 'created'}
+    output_list = [{'username': 'logged'}]
+
+    output_max_time_create = 10
+    output_max_time_list = 0
+    output_time_repeats = 3
+
+    def setUp(self):
+        self.logged_user.bind_user(User.objects.create(username='logged'))
+
+    def test_create(self):
+        self._test(self.logged_user, 'create')
+
+        # repeated requests are rolled back
+        self.assertEqual(User.objects.filter(username='created').count(), 1)
+        self.assertEqual(len(self.timing['samples']), 3)
+        self.assertEqual(self.timing['time'], percentile(self.timing['samples'], 90))
+        self.assertEqual(self.timing['operation'], 'create')
+        self.assertEqual(self.timing['rest_user'], 'logged_user')
+
+    def test_exceeded(self):
+        with self.assertRaises(AssertionError) as context:
+            self._test(self.logged_user, 'list')
+        self.assertIn('Expected 90th percentile of time at most 0.000000s but it was', str(context.exception))
+        self.assertEqual(self.timing['max_time'], 0)